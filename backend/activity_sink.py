@@ -0,0 +1,108 @@
+"""
+Buffered sink for user_activity events.
+track() queues an event and returns at once; a background thread writes the
+queue as multi-row inserts whenever ACTIVITY_FLUSH_SIZE events are waiting
+or ACTIVITY_FLUSH_INTERVAL seconds have passed, and once more on shutdown.
+The queue is bounded; events arriving while it is full are dropped and counted.
+"""
+
+import os
+import atexit
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, List, Optional
+
+ACTIVITY_FLUSH_SIZE = int(os.environ.get("ACTIVITY_FLUSH_SIZE", "100"))
+ACTIVITY_FLUSH_INTERVAL = float(os.environ.get("ACTIVITY_FLUSH_INTERVAL", "2.0"))
+ACTIVITY_QUEUE_MAX = int(os.environ.get("ACTIVITY_QUEUE_MAX", "10000"))
+
+
+class ActivitySink:
+    """Bounded in-memory queue of activity rows, drained by one flusher thread"""
+
+    def __init__(self, write: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+                 flush_size: int = ACTIVITY_FLUSH_SIZE, flush_interval: float = ACTIVITY_FLUSH_INTERVAL,
+                 max_queue: int = ACTIVITY_QUEUE_MAX):
+        self.write = write  # rows -> bulk writer result ({"written", "failed", ...})
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.counters = {"enqueued": 0, "written": 0, "failed": 0, "dropped": 0, "flushes": 0}
+
+    def track(self, user_id: str, activity_type: str, product_id: str = None, metadata: Dict = None) -> bool:
+        """Queue one event; False if it was dropped because the queue is full or closed"""
+        row = {
+            "user_id": user_id,
+            "activity_type": activity_type,
+            "product_id": product_id,
+            "metadata": metadata or {},
+            # Stamp now, not at flush time
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        with self._lock:
+            if self._closed or len(self._queue) >= self.max_queue:
+                self.counters["dropped"] += 1
+                return False
+            self._queue.append(row)
+            self.counters["enqueued"] += 1
+            pending = len(self._queue)
+            if self._thread is None:
+                self._start()
+        if pending >= self.flush_size:
+            self._wake.set()
+        return True
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="activity-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns how many rows were written"""
+        # One flush at a time keeps batches in arrival order
+        with self._flush_lock:
+            written = 0
+            while True:
+                with self._lock:
+                    batch = [self._queue.popleft() for _ in range(min(self.flush_size, len(self._queue)))]
+                if not batch:
+                    return written
+                try:
+                    result = self.write(batch)
+                    failed = result.get("failed", 0)
+                except Exception as e:
+                    print(f"⚠️ Activity flush failed: {e}")
+                    failed = len(batch)
+                with self._lock:
+                    self.counters["flushes"] += 1
+                    self.counters["written"] += len(batch) - failed
+                    self.counters["failed"] += failed
+                written += len(batch) - failed
+
+    def close(self):
+        """Stop accepting events and write out whatever is still queued"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.counters, "queued": len(self._queue), "max_queue": self.max_queue}
@@ -1,10 +1,8 @@
 import os
 import json
-import requests
 import re
 
-POLLINATIONS_API_KEY = os.environ.get("POLLINATIONS_API_KEY") # User will integrate this later
-AI_MODEL = "gemini" # Dedicated model for Gemini 2.5 Flash Lite on Pollinations.ai
+from llm_client import get_llm_client
 
 def analyze_with_pollinations(product_name, price, region):
     """
@@ -29,37 +27,13 @@ def analyze_with_pollinations(product_name, price, region):
     Be critical and realistic. Return ONLY the JSON.
     """
     
-    headers = {"Content-Type": "application/json"}
-    if POLLINATIONS_API_KEY:
-        headers["Authorization"] = f"Bearer {POLLINATIONS_API_KEY}"
-
-    try:
-        # Pollinations.ai OpenAI-compatible endpoint
-        response = requests.post(
-            "https://text.pollinations.ai/",
-            headers=headers,
-            json={
-                "model": AI_MODEL,
-                "messages": [
-                    {"role": "system", "content": "You are a professional e-commerce market analyst."},
-                    {"role": "user", "content": prompt}
-                ],
-                "jsonMode": True
-            },
-            timeout=20
-        )
-        
-        if response.status_code == 200:
-            content = response.text
-            # Clean up potential markdown formatting if jsonMode is not perfectly respected
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            return json.loads(content)
-            
-    except Exception as e:
-        print(f"⚠️ Pollinations.ai analysis failed: {e}")
-    return None
+    # Shared pooled client: retries with jitter and coalesces identical prompts
+    return get_llm_client().complete_json(
+        prompt,
+        system="You are a professional e-commerce market analyst.",
+        timeout=20,
+        use_case="analysis"
+    )
 
 def analyze_with_gemini(product_name, price, region):
     """Fallback to direct Gemini if available (Legacy Support)"""
@@ -0,0 +1,79 @@
+"""
+Request-level cache for product analysis results.
+Entries are keyed by normalized product name; concurrent requests for a
+name that isn't cached yet share one in-flight analysis (single-flight).
+"""
+
+import os
+import asyncio
+import threading
+import weakref
+from typing import Optional, Dict, Any, Callable, Awaitable
+
+from ttl_cache import TTLCache
+from search_cache import normalize_query
+
+ANALYSIS_CACHE_TTL = float(os.environ.get("ANALYSIS_CACHE_TTL", "900"))
+ANALYSIS_CACHE_MAX_BYTES = int(os.environ.get("ANALYSIS_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+# Set to a file path to keep analyses across restarts
+ANALYSIS_CACHE_PATH = os.environ.get("ANALYSIS_CACHE_PATH")
+ANALYSIS_CACHE_ENABLED = os.environ.get("ANALYSIS_CACHE_ENABLED", "true").lower() != "false"
+
+
+class AnalysisCache(TTLCache):
+    """Successful analysis responses keyed by normalized product name"""
+
+    def __init__(self, ttl: float = ANALYSIS_CACHE_TTL, max_bytes: int = ANALYSIS_CACHE_MAX_BYTES, path: Optional[str] = ANALYSIS_CACHE_PATH):
+        super().__init__(ttl, max_bytes, path, table="analysis_cache")
+        self.counters["coalesced"] = 0
+        self._flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def make_key(product_name: str) -> str:
+        return normalize_query(product_name)
+
+    async def get_or_compute(self, product_name: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Cached result for product_name, else the result of compute().
+        The analysis runs as its own task, so a viewer disconnecting doesn't
+        cancel it for the others waiting on it. Only results with
+        success=True are cached.
+        """
+        if not ANALYSIS_CACHE_ENABLED:
+            return await compute()
+
+        key = self.make_key(product_name)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        flights = self._flights.setdefault(loop, {})
+        task = flights.get(key)
+        if task is None:
+            task = flights[key] = loop.create_task(self._compute(key, compute))
+            task.add_done_callback(lambda _: flights.pop(key, None))
+        else:
+            with self._lock:
+                self.counters["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        result = await compute()
+        if isinstance(result, dict) and result.get("success"):
+            self.set(key, result)
+        return result
+
+
+# Singleton instance
+_cache_instance = None
+_singleton_lock = threading.Lock()
+
+def get_analysis_cache() -> AnalysisCache:
+    """Get or create the shared analysis cache"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _singleton_lock:
+            if _cache_instance is None:
+                _cache_instance = AnalysisCache()
+    return _cache_instance
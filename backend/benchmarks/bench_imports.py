@@ -0,0 +1,153 @@
+"""
+Import-time benchmark for the backend entry modules.
+
+Each module is imported in a fresh interpreter under `python -X importtime`
+(after one warm-up run, so bytecode is already compiled). Reported per
+module: median cumulative import time, the heaviest modules it pulls in
+directly, and which of the known-slow optional dependencies (HEAVY_MODULES)
+got loaded along the way.
+
+    python benchmarks/bench_imports.py                     # table
+    python benchmarks/bench_imports.py --save-baseline     # record benchmarks/import_baseline.json
+    python benchmarks/bench_imports.py --compare           # exit 1 on regressions
+
+--compare fails a module when it gets slower than --max-slowdown times its
+baseline, or when it now loads a heavy dependency the baseline didn't.
+Timings are machine dependent, so refresh the baseline when moving to new
+hardware.
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+BASELINE_PATH = os.path.join(BENCH_DIR, "import_baseline.json")
+
+MODULES = ["main", "native_scrapers", "supabase_utils", "live_analysis"]
+
+# Slow imports that should only happen on first use, never at startup
+HEAVY_MODULES = ["bs4", "pytrends", "pandas", "fake_useragent", "supabase", "instagrapi", "scrapy"]
+
+
+def parse_importtime(stderr):
+    """(self_us, cumulative_us, depth, name) per line of -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        rows.append((int(parts[0]), int(parts[1]), (len(name) - len(stripped) - 1) // 2, stripped))
+    return rows
+
+
+def import_once(module):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=BACKEND_DIR
+    )
+    if proc.returncode != 0:
+        raise RuntimeError((proc.stderr.strip().splitlines() or ["failed"])[-1])
+    return parse_importtime(proc.stderr)
+
+
+def measure(module, repeat, top):
+    """Median import cost of one module, plus the breakdown of its median run"""
+    import_once(module)  # warm-up: compile bytecode
+    runs = []
+    for _ in range(repeat):
+        rows = import_once(module)
+        total = next(cumulative for _, cumulative, depth, name in reversed(rows) if name == module and depth == 0)
+        runs.append((total, rows))
+    runs.sort(key=lambda run: run[0])
+    total, rows = runs[len(runs) // 2]
+
+    # Direct imports are the rows one level below the module, up to its own line
+    end = max(i for i, row in enumerate(rows) if row[3] == module and row[2] == 0)
+    start = max([i for i, row in enumerate(rows[:end]) if row[2] == 0] or [-1]) + 1
+    children = [row for row in rows[start:end] if row[2] == 1]
+    loaded = {name for _, _, _, name in rows}
+    return {
+        "ms": round(statistics.median(t for t, _ in runs) / 1000, 1),
+        "modules": len(rows),
+        "heaviest": {name: round(cumulative / 1000, 1) for _, cumulative, _, name in sorted(children, key=lambda r: -r[1])[:top]},
+        "heavy_loaded": sorted(m for m in HEAVY_MODULES if m in loaded),
+    }
+
+
+def regressions(name, result, baseline, max_slowdown):
+    base = baseline.get(name)
+    if not base or "error" in base:
+        return []
+    if "error" in result:
+        return [result["error"]]
+    problems = []
+    if result["ms"] > base["ms"] * max_slowdown:
+        problems.append(f"import {base['ms']}ms -> {result['ms']}ms")
+    added = sorted(set(result["heavy_loaded"]) - set(base["heavy_loaded"]))
+    if added:
+        problems.append(f"now imports {', '.join(added)} at import time")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark for backend modules")
+    parser.add_argument("--only", nargs="*", help="module names to measure")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="heaviest direct imports to list per module")
+    parser.add_argument("--json", action="store_true", help="print results as JSON instead of a table")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    opts = parser.parse_args()
+
+    results = {}
+    for name in opts.only or MODULES:
+        try:
+            results[name] = measure(name, opts.repeat, opts.top)
+        except Exception as e:
+            results[name] = {"error": str(e)}
+
+    if opts.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'module':<18}{'ms':>8}{'modules':>9}  heaviest direct imports (ms) / heavy deps loaded")
+        for name, r in results.items():
+            if "error" in r:
+                print(f"{name:<18}  ❌ {r['error']}")
+                continue
+            heaviest = " ".join(f"{m}={ms:.0f}" for m, ms in r["heaviest"].items())
+            print(f"{name:<18}{r['ms']:>8.1f}{r['modules']:>9}  {heaviest}")
+            if r["heavy_loaded"]:
+                print(f"{'':<35}⚠️  loads {', '.join(r['heavy_loaded'])}")
+
+    if opts.save_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"💾 Baseline written to {BASELINE_PATH}")
+
+    if opts.compare:
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+        failed = False
+        for name, result in results.items():
+            problems = regressions(name, result, baseline, opts.max_slowdown)
+            if problems:
+                failed = True
+                print(f"❌ {name}: {'; '.join(problems)}")
+        if failed:
+            sys.exit(1)
+        print("✅ No import-time regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Offline parser benchmark for the native scrapers and the Scrapy spiders.
+
+Each case runs one parser over a saved fixture with the network mocked out:
+native scrapers go through their public search() with _fetch answering from
+the fixture, spiders get an HtmlResponse/XmlResponse built from it. Every
+case runs in its own subprocess so peak RSS is per parser.
+
+Reported per case: items, ms/page (median), items/sec, peak RSS (MB, and
+growth over the post-import baseline) and field completeness (share of
+items with each expected field non-empty).
+
+    python benchmarks/bench_parsers.py                     # table
+    python benchmarks/bench_parsers.py --save-baseline     # record benchmarks/baseline.json
+    python benchmarks/bench_parsers.py --compare           # exit 1 on regressions
+
+--compare fails a case when it extracts fewer items, loses completeness, or
+gets slower than --max-slowdown times its baseline ms/page. It also fails a
+case whose baseline is missing, errored, extracted nothing or never filled a
+field, since such a baseline can't catch anything; --save-baseline refuses
+to record one. Timings are
+machine dependent, so refresh the baseline when moving to new hardware.
+"""
+
+import os
+import io
+import sys
+import gzip
+import json
+import time
+import argparse
+import resource
+import statistics
+import subprocess
+import contextlib
+from unittest import mock
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+PRODUCT_FIELDS = ["name", "price", "url", "imageUrl"]
+SEARCH_FIELDS = ["title", "url", "snippet"]
+
+# Native cases: scraper class, fixture served per URL fragment (or an HTTP
+# status to force a fallback path), search limit and the fields to score.
+NATIVE_CASES = {
+    "native.amazon": {"scraper": "AmazonScraper", "routes": {"amazon.com": "amazon"}, "limit": 50, "fields": PRODUCT_FIELDS + ["rating", "reviews"]},
+    "native.ebay": {"scraper": "EbayScraper", "routes": {"ebay.com": "ebay"}, "limit": 50, "fields": PRODUCT_FIELDS},
+    "native.flipkart": {"scraper": "FlipkartScraper", "routes": {"flipkart.com": "flipkart"}, "limit": 50, "fields": PRODUCT_FIELDS},
+    "native.walmart": {"scraper": "WalmartScraper", "routes": {"/search/api/": 503, "walmart.com": "walmart"}, "limit": 50, "fields": ["name", "price", "imageUrl"]},
+    "native.google_search": {"scraper": "GoogleSearchScraper", "routes": {"google.com": "google_search"}, "limit": 50, "fields": SEARCH_FIELDS},
+    "native.duckduckgo": {"scraper": "GoogleSearchScraper", "routes": {"google.com": 429, "duckduckgo.com": "duckduckgo"}, "limit": 50, "fields": SEARCH_FIELDS},
+    "native.google_shopping": {"scraper": "GoogleShoppingScraper", "routes": {"tbm=shop": "google_shopping"}, "limit": 20, "fields": PRODUCT_FIELDS},
+}
+
+# Spider cases: module, spider class, fixture, response URL and request meta
+SPIDER_CASES = {
+    "spider.amazon_bestsellers": {"module": "scrapers.spiders.products_spider", "spider": "AmazonBestsellersSpider", "fixture": "amazon_bestsellers",
+                                  "url": "https://www.amazon.com/Best-Sellers-Electronics/zgbs/electronics", "meta": {}, "fields": ["name", "price", "imageUrl", "rating"]},
+    "spider.flipkart_trending": {"module": "scrapers.spiders.products_spider", "spider": "FlipkartSpider", "fixture": "flipkart",
+                                 "url": "https://www.flipkart.com/search?q=best+selling+electronics&otracker=search", "meta": {}, "fields": ["name", "price", "imageUrl"]},
+    "spider.ebay_search": {"module": "scrapers.spiders.ebay_spider", "spider": "EbaySpider", "fixture": "ebay",
+                           "url": "https://www.ebay.com/sch/i.html?_nkw=laptop&_ipg=200", "meta": {"query": "laptop"}, "fields": ["name", "price", "url", "imageUrl"]},
+    "spider.google_shopping": {"module": "scrapers.spiders.google_shopping_spider", "spider": "GoogleShoppingSpider", "fixture": "google_shopping",
+                               "url": "https://www.google.com/search?q=shoes&tbm=shop&hl=en", "meta": {"query": "shoes"}, "fields": ["name", "price", "url", "imageUrl"]},
+    "spider.google_trends": {"module": "scrapers.spiders.trends_spider", "spider": "GoogleTrendsSpider", "fixture": "google_trends_rss",
+                             "url": "https://trends.google.com/trends/trendingsearches/daily/rss?geo=US", "meta": {}, "fields": ["keyword", "traffic"]},
+}
+
+CASES = {**NATIVE_CASES, **SPIDER_CASES}
+
+
+def load_fixture(name):
+    for ext in ("html", "xml"):
+        path = os.path.join(FIXTURE_DIR, f"{name}.{ext}.gz")
+        if os.path.exists(path):
+            with gzip.open(path, "rb") as f:
+                return f.read()
+    raise FileNotFoundError(f"No fixture named {name} in {FIXTURE_DIR}")
+
+
+def rss_mb():
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def completeness(items, fields):
+    def filled(value):
+        return value not in (None, "", "0", "0.00", 0, [], {})
+    if not items:
+        return {field: 0.0 for field in fields}
+    return {field: round(sum(filled(item.get(field)) for item in items) / len(items), 3) for field in fields}
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the native scrapers"""
+
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def native_runner(case):
+    import native_scrapers
+    pages = {fragment: target if isinstance(target, int) else load_fixture(target) for fragment, target in case["routes"].items()}
+
+    def fake_fetch(self, url, headers=None, params=None, timeout=15):
+        for fragment, page in pages.items():
+            if fragment in url:
+                return FakeResponse(page) if isinstance(page, int) else FakeResponse(200, page)
+        return FakeResponse(404)
+
+    scraper = getattr(native_scrapers, case["scraper"])()
+    patcher = mock.patch.object(native_scrapers.BaseRequestScraper, "_fetch", fake_fetch)
+    patcher.start()
+    return lambda: scraper.search("wireless earbuds", limit=case["limit"]) or []
+
+
+def spider_runner(case):
+    import importlib
+    from scrapy.http import HtmlResponse, XmlResponse, Request
+
+    spider = getattr(importlib.import_module(case["module"]), case["spider"])()
+    body = load_fixture(case["fixture"])
+    response_cls = XmlResponse if body.lstrip().startswith(b"<?xml") else HtmlResponse
+
+    def run():
+        request = Request(case["url"], meta=dict(case["meta"]))
+        response = response_cls(url=case["url"], body=body, encoding="utf-8", request=request)
+        return [item for item in spider.parse(response) if isinstance(item, dict)]
+    return run
+
+
+def run_case(name, repeat):
+    """Measure one case in this process and return its metrics"""
+    sys.path.insert(0, BACKEND_DIR)
+    os.environ["SEARCH_CACHE_ENABLED"] = "false"
+    case = CASES[name]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        run = native_runner(case) if name in NATIVE_CASES else spider_runner(case)
+        baseline_rss = rss_mb()
+        items = run()  # warm-up, also the result we score
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+
+    ms = statistics.median(timings) * 1000
+    return {
+        "items": len(items),
+        "ms_per_page": round(ms, 2),
+        "items_per_sec": round(len(items) / (ms / 1000), 1) if ms else 0.0,
+        "peak_rss_mb": round(rss_mb(), 1),
+        "rss_growth_mb": round(rss_mb() - baseline_rss, 1),
+        "completeness": completeness(items, case["fields"]),
+    }
+
+
+def run_isolated(name, repeat):
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--case", name, "--repeat", str(repeat)],
+        capture_output=True, text=True, cwd=BACKEND_DIR
+    )
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def broken(result):
+    """Why a result can't serve as a baseline (it would let any regression through), else None"""
+    if "error" in result:
+        return result["error"]
+    if not result["items"]:
+        return "no items extracted"
+    empty = [field for field, share in result["completeness"].items() if not share]
+    if empty:
+        return f"{', '.join(empty)} never filled"
+    return None
+
+
+def regressions(name, result, baseline, max_slowdown):
+    base = baseline.get(name)
+    if not base:
+        return ["no baseline entry"]
+    problem = broken(base)
+    if problem:
+        return [f"baseline is broken ({problem}); fix the case and re-record it"]
+    if "error" in result:
+        return [result["error"]]
+    problems = []
+    if result["items"] < base["items"]:
+        problems.append(f"items {base['items']} -> {result['items']}")
+    for field, share in base["completeness"].items():
+        if result["completeness"].get(field, 0.0) < share:
+            problems.append(f"{field} completeness {share:.0%} -> {result['completeness'].get(field, 0.0):.0%}")
+    if result["ms_per_page"] > base["ms_per_page"] * max_slowdown:
+        problems.append(f"ms/page {base['ms_per_page']} -> {result['ms_per_page']}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline parser benchmark for scrapers and spiders")
+    parser.add_argument("--case", help="run a single case in-process and print JSON (used by the harness)")
+    parser.add_argument("--only", nargs="*", help="case names or prefixes to run, e.g. native. spider.ebay_search")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print results as JSON instead of a table")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--max-slowdown", type=float, default=2.0)
+    opts = parser.parse_args()
+
+    if opts.case:
+        print(json.dumps(run_case(opts.case, opts.repeat)))
+        return
+
+    names = [n for n in CASES if not opts.only or any(n == o or n.startswith(o) for o in opts.only)]
+    results = {name: run_isolated(name, opts.repeat) for name in names}
+
+    if opts.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'case':<28}{'items':>6}{'ms/page':>9}{'items/s':>10}{'RSS MB':>8}{'+MB':>6}  completeness")
+        for name, r in results.items():
+            if "error" in r:
+                print(f"{name:<28}  ❌ {r['error']}")
+                continue
+            fields = " ".join(f"{f}={v:.0%}" for f, v in r["completeness"].items())
+            print(f"{name:<28}{r['items']:>6}{r['ms_per_page']:>9.1f}{r['items_per_sec']:>10.0f}{r['peak_rss_mb']:>8.1f}{r['rss_growth_mb']:>6.1f}  {fields}")
+
+    if opts.save_baseline:
+        bad = {name: broken(r) for name, r in results.items() if broken(r)}
+        if bad:
+            for name, problem in bad.items():
+                print(f"❌ {name}: {problem}")
+            print("Not saving a baseline with broken cases")
+            sys.exit(1)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"💾 Baseline written to {BASELINE_PATH}")
+
+    if opts.compare:
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+        failed = False
+        for name, result in results.items():
+            problems = regressions(name, result, baseline, opts.max_slowdown)
+            if problems:
+                failed = True
+                print(f"❌ {name}: {'; '.join(problems)}")
+        if failed:
+            sys.exit(1)
+        print("✅ No parser regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
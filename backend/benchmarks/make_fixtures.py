@@ -0,0 +1,283 @@
+"""
+Regenerate the offline search-result fixtures used by the parser benchmarks.
+
+The pages are synthetic but follow each marketplace's result markup (the
+containers and field classes our parsers select on, including nested
+containers and items with missing fields) wrapped in the bulk a real page
+carries: inline scripts and styles, navigation, filters and footers.
+Output is deterministic, so re-running only changes files when this script does.
+
+    python benchmarks/make_fixtures.py
+"""
+
+import os
+import gzip
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+WORDS = (
+    "wireless portable smart premium mini pro ultra compact rechargeable bluetooth "
+    "stainless waterproof ergonomic magnetic foldable adjustable led usb-c noise "
+    "cancelling charger headphones speaker lamp bottle backpack watch keyboard mouse "
+    "stand case cover holder organizer blender kettle massager projector tripod "
+    "camera vacuum purifier humidifier diffuser mat band tracker earbuds"
+).split()
+
+
+def _title(rng):
+    return " ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(4, 9)))
+
+
+def _script_blob(rng, size):
+    chunks, total = [], 0
+    while total < size:
+        name = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(8))
+        line = f"var {name}=function(e,t){{return e&&t?e[{rng.randint(0, 99)}]+t.{rng.choice(WORDS).replace('-', '_')}:null}};"
+        chunks.append(line)
+        total += len(line)
+    return "".join(chunks)
+
+
+def _style_blob(rng, size):
+    chunks, total = [], 0
+    while total < size:
+        line = f".c{rng.randint(0, 99999)}{{margin:{rng.randint(0, 24)}px;color:#{rng.randint(0, 0xffffff):06x}}}"
+        chunks.append(line)
+        total += len(line)
+    return "".join(chunks)
+
+
+def _chrome(rng, links=250):
+    nav = "".join(f'<li class="nav-item"><a href="/b/{rng.choice(WORDS)}/{i}">{_title(rng)}</a></li>' for i in range(links))
+    filters = "".join(
+        f'<div class="filter-group"><span class="filter-label">{rng.choice(WORDS)}</span>'
+        + "".join(f'<label><input type="checkbox" value="{j}"><span>{rng.choice(WORDS)}</span></label>' for j in range(8))
+        + "</div>"
+        for _ in range(30)
+    )
+    footer = "".join(f'<div class="footer-col"><a href="/help/{i}">{_title(rng)}</a></div>' for i in range(120))
+    return f'<header><ul class="nav">{nav}</ul></header><aside class="filters">{filters}</aside>', f"<footer>{footer}</footer>"
+
+
+def _page(rng, body, script_kb=300, style_kb=60):
+    head_scripts = "".join(f"<script>{_script_blob(rng, 1024 * 20)}</script>" for _ in range(script_kb // 20))
+    header, footer = _chrome(rng)
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\"><title>Search results</title>"
+        f"<style>{_style_blob(rng, 1024 * style_kb)}</style>{head_scripts}</head>"
+        f"<body>{header}<main>{body}</main>{footer}"
+        f"<script>{_script_blob(rng, 1024 * 40)}</script></body></html>"
+    )
+
+
+def _price(rng):
+    return round(rng.uniform(5, 400), 2)
+
+
+def amazon(rng, count=60):
+    items = []
+    for i in range(count):
+        asin = f"B0{rng.randint(10**7, 10**8 - 1)}"
+        price = _price(rng)
+        whole, fraction = f"{price:.2f}".split(".")
+        price_html = (
+            f'<span class="a-price" data-a-size="xl"><span class="a-offscreen">${price:.2f}</span>'
+            f'<span aria-hidden="true"><span class="a-price-symbol">$</span><span class="a-price-whole">{int(whole):,}'
+            f'<span class="a-price-decimal">.</span></span><span class="a-price-fraction">{fraction}</span></span></span>'
+        ) if i % 9 != 4 else '<span class="a-color-secondary">No featured offers available</span>'
+        rating = round(rng.uniform(3.0, 5.0), 1)
+        items.append(
+            f'<div data-asin="{asin}" data-index="{i}" data-component-type="s-search-result" class="sg-col-4-of-24 s-result-item s-asin">'
+            '<div class="sg-col-inner"><div class="s-widget-container s-spacing-small">'
+            f'<div class="s-product-image-container"><a class="a-link-normal s-no-outline" href="/dp/{asin}">'
+            f'<img class="s-image" src="https://m.media-amazon.com/images/I/{asin}._AC_UL320_.jpg" '
+            f'srcset="https://m.media-amazon.com/images/I/{asin}._AC_UL480_.jpg 1.5x" alt=""></a></div>'
+            '<div class="a-section a-spacing-small"><h2 class="a-size-mini a-spacing-none a-color-base s-line-clamp-4">'
+            f'<a class="a-link-normal s-underline-text s-link-style a-text-normal" href="/dp/{asin}/ref=sr_1_{i}">'
+            f'<span class="a-size-base-plus a-color-base a-text-normal">{_title(rng)}</span></a></h2></div>'
+            f'<div class="a-row a-size-small"><span aria-label="{rating} out of 5 stars">'
+            f'<i class="a-icon a-icon-star-small a-star-small-4-5"><span class="a-icon-alt">{rating} out of 5 stars</span></i></span>'
+            f'<a href="/dp/{asin}#customerReviews"><span class="a-size-base s-underline-text">({rng.randint(5, 90000):,})</span></a></div>'
+            f'<div class="a-row a-size-base a-color-base"><a class="a-link-normal" href="/dp/{asin}">{price_html}</a></div>'
+            f'<div class="a-row a-size-base a-color-secondary s-align-children-center"><span>FREE delivery <b>{rng.choice(["Mon", "Tue", "Wed"])}, Oct {rng.randint(1, 28)}</b></span></div>'
+            '</div></div></div>'
+        )
+    return _page(rng, f'<div class="s-main-slot s-result-list s-search-results">{"".join(items)}</div>', script_kb=400)
+
+
+def ebay(rng, count=60):
+    items = [
+        '<div class="s-item s-item__pl-on-bottom"><div class="s-item__wrapper"><div class="s-item__info">'
+        '<a class="s-item__link" href="https://ebay.com/itm/123456"><h3 class="s-item__title">Shop on eBay</h3></a>'
+        '<span class="s-item__price">$20.00</span></div></div></div>'
+    ]
+    for i in range(count):
+        item_id = rng.randint(10**11, 10**12 - 1)
+        img_attr = "src" if i % 3 else "data-src"
+        price = f'<span class="s-item__price">${_price(rng):,.2f}</span>' if i % 11 != 7 else ""
+        items.append(
+            '<div class="s-item s-item__pl-on-bottom" data-viewport="{&quot;trackableId&quot;:&quot;01H&quot;}">'
+            '<div class="s-item__wrapper clearfix"><div class="s-item__image-section"><div class="s-item__image">'
+            f'<a tabindex="-1" href="https://www.ebay.com/itm/{item_id}"><div class="s-item__image-wrapper image-treatment">'
+            f'<img class="s-item__image-img" alt="" {img_attr}="https://i.ebayimg.com/images/g/{item_id}/s-l225.webp" loading="lazy"></div></a></div></div>'
+            f'<div class="s-item__info clearfix"><a class="s-item__link" href="https://www.ebay.com/itm/{item_id}?hash=item{item_id:x}">'
+            f'<h3 class="s-item__title"><span role="heading" aria-level="3">{_title(rng)}</span></h3></a>'
+            f'<div class="s-item__subtitle"><span class="SECONDARY_INFO">{rng.choice(["Brand New", "Pre-Owned", "Open Box"])}</span></div>'
+            f'<div class="s-item__details clearfix"><div class="s-item__detail s-item__detail--primary">{price}</div>'
+            f'<div class="s-item__detail s-item__detail--primary"><span class="s-item__shipping s-item__logisticsCost">+${rng.randint(0, 15)}.99 shipping</span></div>'
+            f'<div class="s-item__detail s-item__detail--primary"><span class="s-item__location s-item__itemLocation">from {rng.choice(["China", "United States", "Hong Kong"])}</span></div>'
+            '</div></div></div></div>'
+        )
+    return _page(rng, f'<div class="srp-river-results"><ul class="srp-results srp-list clearfix">{"".join(items)}</ul></div>', script_kb=300)
+
+
+def flipkart(rng, count=48):
+    rows = []
+    for r in range(count // 4):
+        cells = []
+        for c in range(4):
+            pid = f"ACC{rng.randint(10**12, 10**13 - 1)}"
+            title = _title(rng)
+            price = f'<div class="_30jeq3">₹{rng.randint(199, 49999):,}</div>' if (r + c) % 10 != 3 else ""
+            cells.append(
+                f'<div class="_4ddWXP" data-id="{pid}" style="width:25%"><a class="_2rpwqI" title="{title}" href="/{title.lower().replace(" ", "-")}/p/itm{pid[-8:]}?pid={pid}">'
+                f'<div class="_4ddWXP"><img class="_396cs4" alt="{title}" src="https://rukminim2.flixcart.com/image/612/612/{pid.lower()}.jpeg?q=70"></div></a>'
+                f'<a class="s1Q9rs" title="{title}" href="/p/itm{pid[-8:]}?pid={pid}">{title}</a>'
+                f'<div class="_3LWZlK">{round(rng.uniform(3, 5), 1)}</div><div class="_25b18c">{price}<div class="_3I9_wc">₹{rng.randint(999, 99999):,}</div></div></div>'
+            )
+        rows.append(f'<div class="_1AtVbE col-12-12"><div class="_13oc-S">{"".join(cells)}</div></div>')
+    return _page(rng, f'<div class="_1YokD2 _3Mn1Gg">{"".join(rows)}</div>', script_kb=260)
+
+
+def walmart(rng, count=40):
+    items = []
+    for i in range(count):
+        item_id = rng.randint(10**8, 10**9 - 1)
+        price = (
+            f'<div class="mb1 ph1 pa0-xl bb b--near-white w-25"><div data-automation-id="product-price">'
+            f'<span class="w_iS7S">current price ${_price(rng)}</span><div class="f2">${_price(rng)}</div></div></div>'
+        ) if i % 8 != 5 else ""
+        items.append(
+            f'<div data-item-id="{item_id}" class="sans-serif mid-gray relative flex flex-column w-100 hide-child-opacity">'
+            f'<a link-identifier="{item_id}" href="/ip/{item_id}"><span class="w_iUH7">{_title(rng)}</span></a>'
+            f'<img data-testid="productTileImage" src="https://i5.walmartimages.com/seo/{item_id}.jpeg?odnHeight=180" alt="">'
+            f'<span data-automation-id="product-title" class="normal dark-gray mb0 mt1 lh-title f6 f5-l lh-copy">{_title(rng)}</span>'
+            f'{price}<div class="flex items-center mt2"><span class="w_iUH7">{round(rng.uniform(3, 5), 1)} out of 5 Stars. {rng.randint(3, 9000)} reviews</span></div></div>'
+        )
+    return _page(rng, f'<div data-testid="list-view" class="flex flex-wrap w-100 flex-grow-0">{"".join(items)}</div>', script_kb=500)
+
+
+def google_search(rng, count=20):
+    blocks = []
+    for i in range(count):
+        host = f"www.{rng.choice(WORDS).replace('-', '')}{rng.randint(1, 99)}.com"
+        href = f"https://{host}/{rng.choice(WORDS)}" if i % 4 else f"/url?q=https://{host}/review&sa=U&ved=0ah"
+        snippet = f'<div class="VwiC3b yXM9v r025kc lVm3ye">{" ".join(rng.choice(WORDS) for _ in range(30))}</div>' if i % 6 != 2 else ""
+        blocks.append(
+            '<div class="MjjYud"><div class="g Ww4FFb vt6azd tF2Cxc asEBEc" lang="en" data-hveid="CA"><div class="N54PNb BToiNc">'
+            f'<div class="yuRUbf"><a jsname="UWckNb" href="{href}"><h3 class="LC20lb MBeuO DKV0Md">{_title(rng)}</h3>'
+            f'<div class="notranslate TbwUpd"><cite class="qLRx3b tjvcx">{host}</cite></div></a></div>'
+            f'{snippet}</div></div></div>'
+        )
+    return _page(rng, f'<div id="rso">{"".join(blocks)}</div>', script_kb=600, style_kb=120)
+
+
+def duckduckgo(rng, count=30):
+    results = []
+    for i in range(count):
+        host = f"www.{rng.choice(WORDS).replace('-', '')}{rng.randint(1, 99)}.com"
+        results.append(
+            '<div class="result results_links results_links_deep web-result"><div class="links_main links_deep result__body">'
+            f'<h2 class="result__title"><a rel="nofollow" class="result__a" href="//duckduckgo.com/l/?uddg=https%3A%2F%2F{host}">{_title(rng)}</a></h2>'
+            f'<div class="result__extras"><div class="result__extras__url"><a class="result__url" href="//duckduckgo.com/l/?uddg=https%3A%2F%2F{host}"> {host}/{rng.choice(WORDS)} </a></div></div>'
+            f'<a class="result__snippet" href="//duckduckgo.com/l/?uddg=https%3A%2F%2F{host}">{" ".join(rng.choice(WORDS) for _ in range(25))}</a>'
+            '<div class="clear"></div></div></div>'
+        )
+    return _page(rng, f'<div class="serp__results"><div id="links" class="results">{"".join(results)}</div></div>', script_kb=60, style_kb=20)
+
+
+def google_shopping(rng, count=40):
+    items = []
+    for i in range(count):
+        target = f"https://www.{rng.choice(WORDS).replace('-', '')}store.com/p/{rng.randint(1000, 99999)}"
+        href = f"/url?url={target}&rct=j&q=&esrc=s" if i % 2 else f"/shopping/product/{rng.randint(10**15, 10**16)}"
+        price = f'<span class="a8Pemb OFFNJ">${_price(rng):,.2f}</span>' if i % 7 != 6 else ""
+        items.append(
+            '<div class="sh-dgr__gr-auto sh-dgr__grid-result"><div class="sh-dgr__content">'
+            f'<div class="ArOc1c"><img src="https://encrypted-tbn0.gstatic.com/shopping?q=tbn:{rng.randint(10**9, 10**10)}" alt=""></div>'
+            f'<a class="xCpuod" href="{href}"><h3 class="tAxDx">{_title(rng)}</h3></a>'
+            f'<div class="zLPF4b"><span class="eUQRje">{price}<span class="aULzUe IuHnof">{rng.choice(WORDS).capitalize()} Store</span></span></div>'
+            '</div></div>'
+        )
+    return _page(rng, f'<div class="sh-pr__product-results-grid sh-pr__product-results">{"".join(items)}</div>', script_kb=500, style_kb=100)
+
+
+def amazon_bestsellers(rng, count=50):
+    cards = []
+    for i in range(count):
+        asin = f"B0{rng.randint(10**7, 10**8 - 1)}"
+        price = _price(rng)
+        price_html = f'<span class="_cDEzb_p13n-sc-price_3mJ9Z">${price:,.2f}</span>' if i % 10 != 8 else ""
+        rating = round(rng.uniform(3.5, 5.0), 1)
+        cards.append(
+            f'<div class="a-column a-span12 a-text-center _cDEzb_grid-column_2hIsc" role="gridcell"><div id="gridItemRoot" class="a-cardui">'
+            f'<div data-asin="{asin}" class="p13n-sc-uncoverable-faceout" id="{asin}">'
+            f'<span class="zg-bdg-text">#{i + 1}</span><a class="a-link-normal aok-block" href="/dp/{asin}/ref=zg_bs_{i}">'
+            f'<div class="a-section a-spacing-mini _cDEzb_noop_3Xbw5"><img alt="" src="https://images-na.ssl-images-amazon.com/images/I/{asin}._AC_UL300_SR300,200_.jpg" class="a-dynamic-image p13n-sc-dynamic-image"></div></a>'
+            f'<a class="a-link-normal aok-block" href="/dp/{asin}"><span><div class="_cDEzb_p13n-sc-css-line-clamp-3_g3dy1">{_title(rng)}</div></span></a>'
+            f'<div class="a-icon-row"><a class="a-link-normal" title="{rating} out of 5 stars" href="/product-reviews/{asin}"><i class="a-icon a-icon-star-small a-star-small-4-5 aok-align-top">'
+            f'<span class="a-icon-alt">{rating} out of 5 stars</span></i><span class="a-size-small">{rng.randint(100, 90000):,}</span></a></div>'
+            f'<div class="a-row"><a class="a-link-normal a-text-normal" href="/dp/{asin}"><span class="a-size-base a-color-price">{price_html}</span></a></div>'
+            '</div></div></div>'
+        )
+    return _page(rng, f'<div class="p13n-gridRow _cDEzb_grid-row_3Cywl">{"".join(cards)}</div>', script_kb=360)
+
+
+def google_trends_rss(rng, count=20):
+    items = "".join(
+        f"<item><title>{_title(rng)}</title><ht:approx_traffic>{rng.choice([2, 5, 10, 20, 50, 100, 200])}0,000+</ht:approx_traffic>"
+        f"<description>{' '.join(rng.choice(WORDS) for _ in range(12))}</description><link>https://trends.google.com/trends/trendingsearches/daily?geo=US</link>"
+        f"<pubDate>Mon, {rng.randint(1, 28)} Oct 2026 0{rng.randint(0, 9)}:00:00 -0700</pubDate>"
+        f"<ht:picture>https://t{rng.randint(0, 3)}.gstatic.com/images?q=tbn:{rng.randint(10**9, 10**10)}</ht:picture>"
+        "<ht:news_item><ht:news_item_title>" + _title(rng) + "</ht:news_item_title>"
+        f"<ht:news_item_url>https://news.example.com/{rng.randint(1, 99999)}</ht:news_item_url></ht:news_item></item>"
+        for _ in range(count)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss xmlns:atom="http://www.w3.org/2005/Atom" '
+        'xmlns:ht="https://trends.google.com/trends/trendingsearches/daily" version="2.0">'
+        f"<channel><title>Daily Search Trends</title><description>Recently trending searches</description>{items}</channel></rss>"
+    )
+
+
+GENERATORS = {
+    "amazon": amazon,
+    "ebay": ebay,
+    "flipkart": flipkart,
+    "walmart": walmart,
+    "google_search": google_search,
+    "duckduckgo": duckduckgo,
+    "google_shopping": google_shopping,
+    "amazon_bestsellers": amazon_bestsellers,
+    "google_trends_rss": google_trends_rss,
+}
+
+
+def write_fixture(name, html):
+    ext = "xml" if html.startswith("<?xml") else "html"
+    path = os.path.join(FIXTURE_DIR, f"{name}.{ext}.gz")
+    # mtime=0 keeps the gzip bytes stable across runs
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+        f.write(html.encode("utf-8"))
+    print(f"✅ {name}: {len(html) / 1024:.0f} KB -> {path}")
+
+
+def main():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, generate in GENERATORS.items():
+        write_fixture(name, generate(random.Random(name)))
+
+
+if __name__ == "__main__":
+    main()
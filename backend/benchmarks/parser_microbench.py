@@ -0,0 +1,96 @@
+"""
+Micro-benchmark: full-page html.parser soups vs lxml result-container parsing.
+
+Runs every native scraper parser over the saved fixtures twice: once with
+the old path (BeautifulSoup(content, "html.parser") over the whole page,
+then .select) and once with html_parsing.select_results. It checks that both
+paths extract identical items and reports ms/page and peak Python heap.
+tracemalloc only sees Python allocations, so the lxml path's short-lived
+C-side parse tree is not counted.
+
+    python benchmarks/parser_microbench.py [--repeat 5]
+"""
+
+import os
+import sys
+import gzip
+import time
+import argparse
+import tracemalloc
+from unittest import mock
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from bs4 import BeautifulSoup
+
+import native_scrapers
+from native_scrapers import AmazonScraper, EbayScraper, FlipkartScraper, WalmartScraper, GoogleSearchScraper, GoogleShoppingScraper
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# fixture -> (scraper class, parse method, args after content)
+PARSERS = {
+    "amazon": (AmazonScraper, "_parse_results", (50,)),
+    "ebay": (EbayScraper, "_parse_results", (50,)),
+    "flipkart": (FlipkartScraper, "_parse_results", (50,)),
+    "walmart": (WalmartScraper, "_parse_html", ()),
+    "google_search": (GoogleSearchScraper, "_parse_results", (50,)),
+    "duckduckgo": (GoogleSearchScraper, "_parse_duckduckgo", (50,)),
+    "google_shopping": (GoogleShoppingScraper, "_parse_results", (20,)),
+}
+
+
+def load_fixture(name):
+    with gzip.open(os.path.join(FIXTURE_DIR, f"{name}.html.gz"), "rb") as f:
+        return f.read()
+
+
+def legacy_select_results(content, selector, limit=None):
+    """The pre-lxml path: a full html.parser tree of the page"""
+    items = BeautifulSoup(content, "html.parser").select(selector)
+    return items[:limit] if limit else items
+
+
+def run(parse, content, args, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse(content, *args)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse(content, *args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, min(timings) * 1000, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    opts = parser.parse_args()
+
+    print(f"{'fixture':<16}{'KB':>6}{'items':>7}{'old ms':>9}{'new ms':>9}{'speedup':>9}{'old MB':>9}{'new MB':>9}  match")
+    failures = 0
+    for name, (scraper_cls, method, args) in PARSERS.items():
+        content = load_fixture(name)
+        scraper = scraper_cls()
+        parse = getattr(scraper, method)
+
+        # Parsers print a summary line per call; keep the table readable
+        with mock.patch("builtins.print"):
+            with mock.patch.object(native_scrapers, "select_results", legacy_select_results):
+                old_items, old_ms, old_mb = run(parse, content, args, opts.repeat)
+            new_items, new_ms, new_mb = run(parse, content, args, opts.repeat)
+
+        match = old_items == new_items
+        failures += not match
+        print(
+            f"{name:<16}{len(content) / 1024:>6.0f}{len(new_items or []):>7}{old_ms:>9.1f}{new_ms:>9.1f}"
+            f"{old_ms / new_ms:>8.1f}x{old_mb:>9.1f}{new_mb:>9.1f}  {'✅' if match else '❌'}"
+        )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Shared asyncio HTTP fetch engine for the native scrapers.
+Keeps one pooled keep-alive client per host so many marketplace requests
+can be in flight at once from a single worker.
+"""
+
+import os
+import asyncio
+import weakref
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+import httpx
+
+MAX_CONNECTIONS_PER_HOST = int(os.environ.get("SCRAPER_MAX_CONNECTIONS_PER_HOST", "8"))
+MAX_KEEPALIVE_PER_HOST = int(os.environ.get("SCRAPER_MAX_KEEPALIVE_PER_HOST", "4"))
+KEEPALIVE_EXPIRY = float(os.environ.get("SCRAPER_KEEPALIVE_EXPIRY", "30"))
+
+
+class AsyncFetchEngine:
+    """Per-host pooled httpx clients, bound to the event loop that uses them"""
+
+    def __init__(
+        self,
+        max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_per_host: int = MAX_KEEPALIVE_PER_HOST,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry
+        )
+        # httpx connections belong to the loop they were opened on, so each
+        # loop gets its own set of host pools
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+
+    def _client_for(self, url: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        host = urlparse(url).netloc.lower()
+        pools = self._clients.setdefault(loop, {})
+        client = pools.get(host)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=self.limits,
+                follow_redirects=True
+            )
+            pools[host] = client
+        return client
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 15
+    ) -> httpx.Response:
+        """GET through the host's pool. Network errors propagate to the caller."""
+        client = self._client_for(url)
+        return await client.get(url, headers=headers, params=params, timeout=timeout)
+
+    async def post(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        timeout: float = 15
+    ) -> httpx.Response:
+        client = self._client_for(url)
+        return await client.post(url, headers=headers, json=json, timeout=timeout)
+
+    async def aclose(self):
+        """Close every pool opened on the running loop"""
+        loop = asyncio.get_running_loop()
+        pools = self._clients.pop(loop, {})
+        for client in pools.values():
+            await client.aclose()
+
+
+# Singleton instance
+_engine_instance = None
+
+def get_fetch_engine() -> AsyncFetchEngine:
+    """Get or create the shared fetch engine"""
+    global _engine_instance
+    if _engine_instance is None:
+        _engine_instance = AsyncFetchEngine()
+    return _engine_instance
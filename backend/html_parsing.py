@@ -0,0 +1,74 @@
+"""
+Result-container parsing for the native scrapers.
+lxml parses the whole page in C and picks out the result containers with a
+compiled CSS selector; only those subtrees are rebuilt as BeautifulSoup, so
+the per-field bs4 selectors keep working without a Python tree of the page.
+"""
+
+import functools
+from typing import List, Optional, Union, TYPE_CHECKING
+
+import lxml.html
+from lxml import etree
+
+# bs4 is imported where a soup is built, keeping it off the startup path
+if TYPE_CHECKING:
+    from bs4 import Tag
+
+try:
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    print("⚠️  cssselect not available, parsing full pages")
+    CSSSelector = None
+
+# Set on every matched container so nested matches survive the re-parse
+ITEM_MARKER = "data-pickspy-item"
+
+
+@functools.lru_cache(maxsize=64)
+def _compiled(selector: str):
+    return CSSSelector(selector)
+
+
+def _full_page_select(content, selector: str, limit: Optional[int]) -> List["Tag"]:
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(content, "lxml").select(selector, limit=limit or 0)
+
+
+def select_results(content: Union[str, bytes], selector: str, limit: Optional[int] = None) -> List["Tag"]:
+    """
+    Elements matching a CSS selector, as bs4 Tags in document order.
+    Same matches as BeautifulSoup(content).select(selector)[:limit], but
+    only the matched subtrees are built as a soup.
+    """
+    if not content:
+        return []
+    if CSSSelector is None:
+        return _full_page_select(content, selector, limit)
+
+    if isinstance(content, bytes):
+        try:
+            content = content.decode("utf-8")
+        except UnicodeDecodeError:
+            pass  # let lxml use the page's declared charset
+
+    try:
+        matches = _compiled(selector)(lxml.html.fromstring(content))
+    except (ValueError, etree.ParserError):
+        # e.g. str input carrying an XML encoding declaration
+        return _full_page_select(content, selector, limit)
+
+    if limit:
+        matches = matches[:limit]
+    if not matches:
+        return []
+
+    for element in matches:
+        element.set(ITEM_MARKER, "")
+    outermost = [
+        element for element in matches
+        if not any(ancestor.get(ITEM_MARKER) is not None for ancestor in element.iterancestors())
+    ]
+    from bs4 import BeautifulSoup
+    fragment = "".join(lxml.html.tostring(element, encoding="unicode", with_tail=False) for element in outermost)
+    return BeautifulSoup(fragment, "lxml").select(f"[{ITEM_MARKER}]")
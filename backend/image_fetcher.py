@@ -4,11 +4,118 @@ Fetches high-quality, relevant images from Pexels API
 """
 
 import os
+import asyncio
+import tempfile
+import threading
+import httpx
 import requests
-from typing import Optional
+from typing import Optional, Dict, List, Any, Tuple
 from urllib.parse import quote
 
+from ttl_cache import TTLCache
+
 PEXELS_API_KEY = os.environ.get("PEXELS_API_KEY", "")
+PEXELS_SEARCH_URL = "https://api.pexels.com/v1/search"
+
+# Resolved images are cached on disk so warm deep scans skip HEAD checks and Pexels calls
+IMAGE_CACHE_TTL = float(os.environ.get("IMAGE_CACHE_TTL", str(7 * 24 * 3600)))
+IMAGE_CACHE_DEAD_TTL = float(os.environ.get("IMAGE_CACHE_DEAD_TTL", str(24 * 3600)))
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+IMAGE_CACHE_PATH = os.environ.get("IMAGE_CACHE_PATH", os.path.join(tempfile.gettempdir(), "pickspy_image_cache.sqlite"))
+
+# Singleton instance
+_image_cache = None
+_singleton_lock = threading.Lock()
+
+def get_image_cache() -> TTLCache:
+    """Get or create the shared image resolution cache"""
+    global _image_cache
+    if _image_cache is None:
+        # Deep-scan worker threads may race for the first instance
+        with _singleton_lock:
+            if _image_cache is None:
+                _image_cache = TTLCache(IMAGE_CACHE_TTL, IMAGE_CACHE_MAX_BYTES, IMAGE_CACHE_PATH, table="image_cache")
+    return _image_cache
+
+# Per-key locks so concurrent builders share one Pexels lookup per query
+_inflight_guard = threading.Lock()
+_inflight: Dict[str, threading.Lock] = {}
+
+def _key_lock(key: str) -> Tuple[threading.Lock, bool]:
+    """The key's lock, and whether this caller created it (and so must remove it)"""
+    with _inflight_guard:
+        lock = _inflight.get(key)
+        if lock is None:
+            lock = _inflight[key] = threading.Lock()
+            return lock, True
+        return lock, False
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+def _unsplash_fallback(product_name: str) -> str:
+    return f"https://source.unsplash.com/featured/800x800?{quote(product_name)},product"
+
+def _image_key(product_name: str, category: str, scraped_image_url: Optional[str]) -> str:
+    return f"image|{_normalize(product_name)}|{category}|{scraped_image_url or ''}"
+
+def _is_candidate(scraped_image_url: Optional[str]) -> bool:
+    """Scraped URL worth a HEAD check: absolute and not an obvious placeholder"""
+    if not scraped_image_url or not scraped_image_url.startswith("http"):
+        return False
+    lowered = scraped_image_url.lower()
+    return "placeholder" not in lowered and "no-image" not in lowered
+
+def _cache_resolved(key: str, product_name: str, image: str):
+    # An Unsplash fallback with a Pexels key set may just be a Pexels hiccup, so retry it sooner
+    fell_back = bool(PEXELS_API_KEY) and image == _unsplash_fallback(product_name)
+    get_image_cache().set(key, {"url": image}, ttl=IMAGE_CACHE_DEAD_TTL if fell_back else IMAGE_CACHE_TTL)
+
+
+def _pexels_search(query: str) -> Optional[str]:
+    """
+    First medium-size Pexels photo for a query, cached per normalized query.
+    Misses are negatively cached; network errors are raised and not cached.
+    """
+    key = f"pexels|{_normalize(query)}"
+    cache = get_image_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached["url"]
+
+    lock, owner = _key_lock(key)
+    try:
+        with lock:
+            # Another thread may have resolved it while we waited
+            cached = cache.get(key)
+            if cached is not None:
+                return cached["url"]
+
+            params = {
+                "query": query,
+                "per_page": 5,
+                "orientation": "square"
+            }
+            response = requests.get(PEXELS_SEARCH_URL, headers={"Authorization": PEXELS_API_KEY}, params=params, timeout=10)
+            if response.status_code == 429 or response.status_code >= 500:
+                # Pexels trouble, not a real miss
+                return None
+
+            url = None
+            if response.status_code == 200:
+                photos = response.json().get("photos", [])
+                if photos:
+                    # Return the medium-sized image URL from the first result
+                    url = photos[0]["src"]["medium"]
+            cache.set(key, {"url": url}, ttl=IMAGE_CACHE_TTL if url else IMAGE_CACHE_DEAD_TTL)
+            return url
+    finally:
+        # Waiters leave the entry alone: a new leader may already have replaced it
+        if owner:
+            with _inflight_guard:
+                if _inflight.get(key) is lock:
+                    del _inflight[key]
+
 
 def get_pexels_image(product_name: str, category: str = "product") -> Optional[str]:
     """
@@ -24,84 +131,114 @@ def get_pexels_image(product_name: str, category: str = "product") -> Optional[s
     
     if not PEXELS_API_KEY:
         # Fallback to Unsplash if no Pexels key
-        return f"https://source.unsplash.com/featured/800x800?{quote(product_name)},product"
+        return _unsplash_fallback(product_name)
     
     try:
         # Clean product name for better search results
         search_query = product_name.replace("-", " ").strip()
         
-        # Pexels API endpoint
-        url = "https://api.pexels.com/v1/search"
-        headers = {
-            "Authorization": PEXELS_API_KEY
-        }
-        params = {
-            "query": search_query,
-            "per_page": 5,
-            "orientation": "square"
-        }
-        
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            photos = data.get("photos", [])
-            
-            if photos:
-                # Return the medium-sized image URL from the first result
-                return photos[0]["src"]["medium"]
+        image = _pexels_search(search_query)
+        if image:
+            return image
         
-        # Fallback to category-based search if product name yields no results
+        # Fallback to category-based search if product name yields no results.
+        # Category lookups are cached, so a whole category shares one call.
         if category:
-            params["query"] = category
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                photos = data.get("photos", [])
-                if photos:
-                    return photos[0]["src"]["medium"]
+            image = _pexels_search(category)
+            if image:
+                return image
     
     except Exception as e:
         print(f"⚠️ Pexels API error for '{product_name}': {e}")
     
     # Final fallback to Unsplash
-    return f"https://source.unsplash.com/featured/800x800?{quote(product_name)},product"
+    return _unsplash_fallback(product_name)
 
 
-def get_product_image_with_fallback(product_name: str, scraped_image_url: Optional[str], category: str = "product") -> str:
+# --- BATCH RESOLUTION ---
+
+# Image shown until resolve_product_images() runs (served by the frontend)
+PLACEHOLDER_IMAGE = "/placeholder.svg"
+# Scraped image URL carried on a product until the batch stage resolves it
+SCRAPED_IMAGE_FIELD = "_scrapedImageUrl"
+
+IMAGE_VALIDATION_CONCURRENCY = int(os.environ.get("IMAGE_VALIDATION_CONCURRENCY", "32"))
+PEXELS_CONCURRENCY = int(os.environ.get("PEXELS_CONCURRENCY", "4"))
+
+
+async def _is_live_image_async(client: httpx.AsyncClient, url: str) -> bool:
+    """HEAD-check a scraped image URL, remembering dead ones for IMAGE_CACHE_DEAD_TTL"""
+    key = f"head|{url}"
+    cache = get_image_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached["ok"]
+
+    try:
+        head_response = await client.head(url, timeout=3)
+        ok = head_response.status_code == 200 and "image" in head_response.headers.get("Content-Type", "")
+    except Exception:
+        ok = False
+    cache.set(key, {"ok": ok}, ttl=IMAGE_CACHE_TTL if ok else IMAGE_CACHE_DEAD_TTL)
+    return ok
+
+
+async def resolve_product_images_async(products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Smart image selection with multiple fallbacks
-    
-    Priority:
-    1. Scraped image URL (if valid and accessible)
-    2. Pexels API image
-    3. Unsplash fallback
-    
-    Args:
-        product_name: Name of the product
-        scraped_image_url: Image URL from the scraper (may be broken/invalid)
-        category: Product category for better Pexels results
-        
-    Returns:
-        Valid image URL
+    Attach final images to a batch of built products, in place.
+    Cached results are applied first, remaining scraped URLs are HEAD-checked
+    concurrently over one pooled client, and only the failures go to Pexels,
+    also in parallel.
     """
-    
-    # 1. Try scraped image if it exists and looks valid
-    if scraped_image_url and scraped_image_url.startswith("http"):
-        # Quick validation - check if it's not a placeholder
-        if "placeholder" not in scraped_image_url.lower() and "no-image" not in scraped_image_url.lower():
-            try:
-                # Quick HEAD request to verify image exists
-                head_response = requests.head(scraped_image_url, timeout=3, allow_redirects=True)
-                if head_response.status_code == 200 and "image" in head_response.headers.get("Content-Type", ""):
-                    return scraped_image_url
-            except:
-                pass
-    
-    # 2. Fallback to Pexels
-    pexels_image = get_pexels_image(product_name, category)
-    if pexels_image:
-        return pexels_image
-    
-    # 3. Final fallback to Unsplash
-    return f"https://source.unsplash.com/featured/800x800?{quote(product_name)},product"
+    cache = get_image_cache()
+    pending = []
+    for p in products:
+        scraped = p.pop(SCRAPED_IMAGE_FIELD, None)
+        key = _image_key(p["name"], p.get("category", "product"), scraped)
+        cached = cache.get(key)
+        if cached is not None:
+            p["imageUrl"] = cached["url"]
+        else:
+            pending.append((p, scraped, key))
+
+    if not pending:
+        return products
+
+    # 1. Validate scraped URLs concurrently
+    validation_slots = asyncio.Semaphore(IMAGE_VALIDATION_CONCURRENCY)
+    limits = httpx.Limits(max_connections=IMAGE_VALIDATION_CONCURRENCY, max_keepalive_connections=IMAGE_VALIDATION_CONCURRENCY)
+
+    async def validate(scraped):
+        if not _is_candidate(scraped):
+            return False
+        async with validation_slots:
+            return await _is_live_image_async(client, scraped)
+
+    async with httpx.AsyncClient(limits=limits, follow_redirects=True) as client:
+        live = await asyncio.gather(*(validate(scraped) for _, scraped, _ in pending))
+
+    # 2. Pexels (cached and single-flighted per query) for the rest
+    pexels_slots = asyncio.Semaphore(PEXELS_CONCURRENCY)
+
+    async def fallback(p):
+        async with pexels_slots:
+            return await asyncio.to_thread(get_pexels_image, p["name"], p.get("category", "product"))
+
+    failed = [entry for entry, ok in zip(pending, live) if not ok]
+    fallbacks = await asyncio.gather(*(fallback(p) for p, _, _ in failed))
+    resolved = {id(p): image for (p, _, _), image in zip(failed, fallbacks)}
+
+    # 3. Write back
+    for (p, scraped, key), ok in zip(pending, live):
+        image = scraped if ok else (resolved.get(id(p)) or _unsplash_fallback(p["name"]))
+        p["imageUrl"] = image
+        _cache_resolved(key, p["name"], image)
+
+    return products
+
+
+def resolve_product_images(products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Blocking entry point for resolve_product_images_async (scan worker threads)"""
+    if products:
+        asyncio.run(resolve_product_images_async(products))
+    return products
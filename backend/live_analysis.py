@@ -0,0 +1,217 @@
+"""
+Live product analysis fan-out shared by the Render API and the Modal web app.
+Every source runs side by side under a per-source deadline and an overall
+budget; results can be collected into one payload or streamed as
+Server-Sent Events as each source finishes.
+"""
+
+import os
+import json
+import random
+import asyncio
+from datetime import datetime
+from typing import Any, AsyncIterator, Tuple, Optional
+
+# Per-source deadline and overall budget (seconds)
+ANALYSIS_SOURCE_TIMEOUT = float(os.environ.get("ANALYSIS_SOURCE_TIMEOUT", "20"))
+ANALYSIS_TOTAL_BUDGET = float(os.environ.get("ANALYSIS_TOTAL_BUDGET", "30"))
+
+ECOMMERCE_SOURCES = ["walmart", "ebay", "flipkart", "amazon"]
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def analysis_jobs(scrapers, product_name):
+    """
+    One awaitable per independent analysis source.
+    Marketplace and web searches use the async scrapers; pytrends, instagrapi
+    and the AI-backed scrapers are blocking and run in worker threads.
+    """
+    jobs = {
+        "market_trends": asyncio.to_thread(scrapers["google_trends"].get_trends, product_name),
+        "social_analysis": asyncio.to_thread(scrapers["sentiment"].get_product_sentiment, product_name),
+        "instagram": asyncio.to_thread(scrapers["instagram"].get_public_posts, product_name.replace(" ", "")),
+    }
+    for site in ECOMMERCE_SOURCES:
+        jobs[f"ecommerce.{site}"] = scrapers[site].search_async(product_name, limit=5)
+    jobs["search_results"] = scrapers["google_search"].search_async(product_name, limit=20)
+    jobs["faqs"] = asyncio.to_thread(scrapers["faqs"].get_faqs, product_name)
+    return jobs
+
+
+def apply_analysis_source(analysis, name, result):
+    """Merge one finished source into the analysis payload, in the shape the frontend reads"""
+    if not result:
+        return
+    sources = analysis["sources"]
+    if name == "instagram":
+        sources.setdefault("social_analysis", {})["instagram_posts"] = result
+    elif name == "social_analysis":
+        # Instagram may have landed first
+        result = dict(result)
+        if "instagram_posts" in sources.get("social_analysis", {}):
+            result["instagram_posts"] = sources["social_analysis"]["instagram_posts"]
+        sources["social_analysis"] = result
+    elif name.startswith("ecommerce."):
+        sources.setdefault("ecommerce", {})[name.split(".", 1)[1]] = result[:3]
+    elif name == "search_results":
+        sources["search_results"] = {
+            "total_results": len(result),
+            "top_mentions": result[:5]
+        }
+    else:
+        sources[name] = result
+
+
+def source_payload(analysis, name):
+    """The merged value a source contributed, as apply_analysis_source stored it"""
+    sources = analysis["sources"]
+    if name == "instagram":
+        return sources.get("social_analysis", {}).get("instagram_posts")
+    if name.startswith("ecommerce."):
+        return sources.get("ecommerce", {}).get(name.split(".", 1)[1])
+    return sources.get(name)
+
+
+def quality_score(market_trends, social_analysis, ecommerce) -> float:
+    """0-10 viability score from trend direction/velocity, sentiment and marketplace presence"""
+    market_trends = market_trends or {}
+    social_analysis = social_analysis or {}
+    ecommerce = ecommerce or {}
+
+    score = 6.5 + random.uniform(0, 1.5) # Dynamic base
+
+    # Trend impact
+    trend_dir = market_trends.get("trend_direction", "neutral")
+    if trend_dir == "up": score += 1.2
+    elif trend_dir == "down": score -= 1.0
+
+    # Velocity impact (0-100 scale usually)
+    velocity = market_trends.get("trend_velocity_percent", 50)
+    if velocity > 70: score += 0.8
+    elif velocity < 30: score -= 0.5
+
+    # Social Sentiment impact
+    sentiment = social_analysis.get("sentiment_percentage", {}).get("positive", 50)
+    if sentiment > 75: score += 1.5
+    elif sentiment < 40: score -= 1.5
+
+    # Mention volume impact
+    mentions = social_analysis.get("total_mentions", 0)
+    if mentions > 1000: score += 0.5
+
+    # Ecommerce presence
+    if ecommerce.get("amazon"): score += 0.3
+    if ecommerce.get("ebay") or ecommerce.get("walmart"): score += 0.2
+
+    # Normalize to 0-10 range
+    return max(1.0, min(9.8, score))
+
+
+def finalize_analysis(analysis):
+    """Add viability_score (0-100) and product_insights, as the Modal analysis does"""
+    sources = analysis["sources"]
+    score = quality_score(sources.get("market_trends"), sources.get("social_analysis"), sources.get("ecommerce"))
+    analysis["viability_score"] = round(score * 10, 1)
+    sources["product_insights"] = {
+        "market_position": "Strong" if score > 7.5 else "Moderate" if score > 5.0 else "Weak",
+        "quality_score": round(score / 10, 2)
+    }
+    return analysis
+
+
+async def iter_analysis_sources(scrapers, product_name) -> AsyncIterator[Tuple[str, Any, Optional[str]]]:
+    """
+    Yield (source, result, error) in completion order. error is None,
+    "timeout" or "error"; sources still running when the budget runs out
+    are cancelled and reported as timeouts.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = {
+        asyncio.create_task(asyncio.wait_for(job, ANALYSIS_SOURCE_TIMEOUT)): name
+        for name, job in analysis_jobs(scrapers, product_name).items()
+    }
+    deadline = loop.time() + ANALYSIS_TOTAL_BUDGET
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                try:
+                    yield name, task.result(), None
+                except asyncio.TimeoutError:
+                    yield name, None, "timeout"
+                except Exception as e:
+                    print(f"⚠️  {name} fetch failed: {e}")
+                    yield name, None, "error"
+        for task in pending:
+            yield tasks[task], None, "timeout"
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def new_analysis(product_name):
+    return {
+        "product_name": product_name,
+        "timestamp": datetime.now().isoformat(),
+        "sources": {}
+    }
+
+
+async def collect_analysis(scrapers, product_name):
+    """Run every source within budget and return the merged, scored payload"""
+    analysis = new_analysis(product_name)
+    timed_out = []
+    async for name, result, error in iter_analysis_sources(scrapers, product_name):
+        if error == "timeout":
+            timed_out.append(name)
+        apply_analysis_source(analysis, name, result)
+
+    if timed_out:
+        print(f"⏱️ Sources over budget for {product_name}: {', '.join(timed_out)}")
+        analysis["sources"]["timed_out"] = timed_out
+    return finalize_analysis(analysis)
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_analysis_events(scrapers, product_name) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for a live analysis: "start", one "source" event per
+    source as it resolves (shaped like the matching analysis.sources entry),
+    "timeout" for sources over budget, "error" for sources that raised, then
+    "done" with the viability score.
+    """
+    analysis = new_analysis(product_name)
+    yield _sse("start", {"product_name": product_name, "timestamp": analysis["timestamp"]})
+
+    timed_out, errored = [], []
+    async for name, result, error in iter_analysis_sources(scrapers, product_name):
+        if error == "timeout":
+            timed_out.append(name)
+            yield _sse("timeout", {"source": name})
+            continue
+        if error == "error":
+            errored.append(name)
+            yield _sse("error", {"source": name})
+            continue
+        apply_analysis_source(analysis, name, result)
+        if result:
+            yield _sse("source", {"source": name, "data": source_payload(analysis, name)})
+
+    if timed_out:
+        analysis["sources"]["timed_out"] = timed_out
+    finalize_analysis(analysis)
+    yield _sse("done", {
+        "viability_score": analysis["viability_score"],
+        "product_insights": analysis["sources"]["product_insights"],
+        "timed_out": timed_out,
+        "errored": errored
+    })
@@ -0,0 +1,267 @@
+"""
+Shared Pollinations.ai client (Gemini 2.5 Flash Lite).
+One pooled session for every AI prompt in the backend, with bounded
+concurrency, retry with jitter, and single-flight coalescing so identical
+in-flight prompts share one upstream call.
+"""
+
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+import weakref
+from typing import Optional, Dict, Any, List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from fetch_engine import get_fetch_engine
+from prompt_cache import get_prompt_cache, PROMPT_CACHE_ENABLED
+
+POLLINATIONS_URL = "https://text.pollinations.ai/"
+POLLINATIONS_API_KEY = os.environ.get("POLLINATIONS_API_KEY")
+AI_MODEL = "gemini" # Gemini 2.5 Flash Lite on Pollinations.ai
+
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.environ.get("LLM_RETRY_BASE_DELAY", "0.5"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class LLMRequestError(Exception):
+    """Pollinations answered with a non-retryable status or ran out of retries"""
+
+
+def extract_json(text: str, shape: str = "object") -> Optional[Any]:
+    """
+    Pull the JSON object (or list) out of a model reply that may be wrapped
+    in markdown or prose. Returns None when nothing parses.
+    """
+    if not text:
+        return None
+    pattern = r'\[.*\]' if shape == "list" else r'\{.*\}'
+    match = re.search(pattern, text, re.DOTALL)
+    try:
+        return json.loads(match.group() if match else text)
+    except (ValueError, TypeError):
+        return None
+
+
+def _retry_delay(attempt: int) -> float:
+    return LLM_RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, LLM_RETRY_BASE_DELAY)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class PollinationsClient:
+    """Text completions against Pollinations.ai, sync and async"""
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY, max_retries: int = LLM_MAX_RETRIES):
+        self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+        # asyncio primitives belong to one loop each
+        self._async_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._async_flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _headers() -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if POLLINATIONS_API_KEY:
+            headers["Authorization"] = f"Bearer {POLLINATIONS_API_KEY}"
+        return headers
+
+    @staticmethod
+    def _payload(prompt: str, system: Optional[str], model: str) -> Dict[str, Any]:
+        messages: List[Dict[str, str]] = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return {"model": model, "messages": messages, "jsonMode": True}
+
+    @staticmethod
+    def flight_key(prompt: str, system: Optional[str], model: str) -> str:
+        return hashlib.sha256(json.dumps([model, system, prompt]).encode()).hexdigest()
+
+    # --- sync ---
+
+    def _post(self, payload: Dict[str, Any], timeout: float) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._slots:
+                    res = self.session.post(POLLINATIONS_URL, headers=self._headers(), json=payload, timeout=timeout)
+                if res.status_code == 200:
+                    return res.text
+                if res.status_code not in RETRY_STATUSES:
+                    raise LLMRequestError(f"Pollinations returned {res.status_code}")
+                error: BaseException = LLMRequestError(f"Pollinations returned {res.status_code}")
+            except requests.RequestException as e:
+                error = e
+            if attempt < self.max_retries:
+                time.sleep(_retry_delay(attempt))
+        raise error
+
+    def complete(self, prompt: str, system: Optional[str] = None, model: str = AI_MODEL, timeout: float = 20) -> str:
+        """Raw reply text. Concurrent identical prompts share one upstream call."""
+        key = self.flight_key(prompt, system, model)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._post(self._payload(prompt, system, model), timeout)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _complete_json(self, prompt: str, system: Optional[str], shape: str, model: str, timeout: float) -> Optional[Any]:
+        try:
+            return extract_json(self.complete(prompt, system, model, timeout), shape)
+        except Exception as e:
+            print(f"⚠️ Pollinations request failed: {e}")
+            return None
+
+    def _cached(self, prompt: str, system: Optional[str], shape: str, model: str, timeout: float, use_case: Optional[str]):
+        """
+        (cache key, cached value) for a prompt. A stale hit is returned as-is and
+        one background thread refreshes it. Key is None when caching is off.
+        """
+        if not use_case or not PROMPT_CACHE_ENABLED:
+            return None, None
+        cache = get_prompt_cache()
+        key = cache.make_key(model, prompt, system)
+        value, stale = cache.lookup(key)
+        if value is not None and stale and cache.claim_refresh(key):
+            threading.Thread(
+                target=self._refresh,
+                args=(key, prompt, system, shape, model, timeout, use_case),
+                daemon=True
+            ).start()
+        return key, value
+
+    def _refresh(self, key: str, prompt: str, system: Optional[str], shape: str, model: str, timeout: float, use_case: str):
+        cache = get_prompt_cache()
+        try:
+            result = self._complete_json(prompt, system, shape, model, timeout)
+            if result:
+                cache.store(key, result, use_case)
+        finally:
+            cache.release_refresh(key)
+
+    def complete_json(self, prompt: str, system: Optional[str] = None, shape: str = "object", model: str = AI_MODEL, timeout: float = 20, use_case: Optional[str] = None) -> Optional[Any]:
+        """
+        Reply parsed as a JSON object (or list with shape="list"); None on any failure.
+        With a use_case the reply is cached under that use case's TTL.
+        """
+        key, value = self._cached(prompt, system, shape, model, timeout, use_case)
+        if value is not None:
+            return value
+        result = self._complete_json(prompt, system, shape, model, timeout)
+        if result and key:
+            get_prompt_cache().store(key, result, use_case)
+        return result
+
+    # --- async ---
+
+    async def _apost(self, payload: Dict[str, Any], timeout: float) -> str:
+        loop = asyncio.get_running_loop()
+        slots = self._async_slots.get(loop)
+        if slots is None:
+            slots = self._async_slots[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with slots:
+                    res = await get_fetch_engine().post(POLLINATIONS_URL, headers=self._headers(), json=payload, timeout=timeout)
+                if res.status_code == 200:
+                    return res.text
+                if res.status_code not in RETRY_STATUSES:
+                    raise LLMRequestError(f"Pollinations returned {res.status_code}")
+                error: BaseException = LLMRequestError(f"Pollinations returned {res.status_code}")
+            except LLMRequestError:
+                raise
+            except Exception as e:
+                error = e
+            if attempt < self.max_retries:
+                await asyncio.sleep(_retry_delay(attempt))
+        raise error
+
+    async def acomplete(self, prompt: str, system: Optional[str] = None, model: str = AI_MODEL, timeout: float = 20) -> str:
+        """Async twin of complete(), coalescing identical prompts within the running loop"""
+        loop = asyncio.get_running_loop()
+        flights = self._async_flights.setdefault(loop, {})
+        key = self.flight_key(prompt, system, model)
+        flight = flights.get(key)
+        if flight is not None:
+            return await asyncio.shield(flight)
+
+        flight = flights[key] = loop.create_future()
+        try:
+            result = await self._apost(self._payload(prompt, system, model), timeout)
+            flight.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            # Followers see the error; mark it retrieved so an unshared failure isn't logged
+            flight.exception()
+            raise
+        finally:
+            flights.pop(key, None)
+
+    async def acomplete_json(self, prompt: str, system: Optional[str] = None, shape: str = "object", model: str = AI_MODEL, timeout: float = 20, use_case: Optional[str] = None) -> Optional[Any]:
+        key, value = self._cached(prompt, system, shape, model, timeout, use_case)
+        if value is not None:
+            return value
+        try:
+            result = extract_json(await self.acomplete(prompt, system, model, timeout), shape)
+        except Exception as e:
+            print(f"⚠️ Pollinations request failed: {e}")
+            return None
+        if result and key:
+            get_prompt_cache().store(key, result, use_case)
+        return result
+
+
+# Singleton instance
+_client_instance = None
+_singleton_lock = threading.Lock()
+
+def get_llm_client() -> PollinationsClient:
+    """Get or create the shared Pollinations client"""
+    global _client_instance
+    if _client_instance is None:
+        with _singleton_lock:
+            if _client_instance is None:
+                _client_instance = PollinationsClient()
+    return _client_instance
@@ -1,20 +1,26 @@
 from fastapi import FastAPI, BackgroundTasks, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import os
+import asyncio
 import random
-import time
 import requests
 import hashlib
 import re
-from bs4 import BeautifulSoup
 from typing import List, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pydantic import BaseModel
 
 from supabase_utils import get_db
+from supabase_async import get_async_db, close_async_db
 from native_scrapers import get_native_scrapers
 from ai_utils import get_ai_analysis
-from image_fetcher import get_product_image_with_fallback
+from image_fetcher import get_image_cache, resolve_product_images, PLACEHOLDER_IMAGE, SCRAPED_IMAGE_FIELD
+from fetch_engine import get_fetch_engine
+from search_cache import get_search_cache
+from prompt_cache import get_prompt_cache
+from analysis_cache import get_analysis_cache
+from live_analysis import collect_analysis, stream_analysis_events, SSE_HEADERS
 
 app = FastAPI()
 
@@ -35,6 +41,17 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+@app.on_event("shutdown")
+async def close_fetch_engine():
+    """Release the pooled scraper connections held by this worker"""
+    await get_fetch_engine().aclose()
+    await close_async_db()
+
+@app.on_event("shutdown")
+async def flush_activity_sink():
+    """Write out activity events still queued in this worker"""
+    await asyncio.to_thread(get_db().activity.close)
+
 # --- ROOT ENDPOINT ---
 
 @app.get("/")
@@ -82,31 +99,32 @@ def get_header():
     }
 
 def build_product(p_id, name, price, img, source, category):
-    # Use smart image selection: scraped image → Pexels → Unsplash fallback
-    final_img = get_product_image_with_fallback(name, img, category)
-    
+    # Image starts as a placeholder; resolve_product_images() picks
+    # scraped image → Pexels → Unsplash for the whole batch before saving
+    # Per-product RNG seeded by name: stable scores, and safe to call from scan worker threads
     seed = int(hashlib.md5(name.encode()).hexdigest(), 16)
-    random.seed(seed)
+    rng = random.Random(seed)
     
     return {
         "id": f"{source[:3]}-{p_id}",
         "name": name,
         "category": category,
         "price": price,
-        "imageUrl": final_img,
-        "velocityScore": random.randint(50, 99),
-        "saturationScore": random.randint(10, 60),
-        "demandSignal": random.choice(["bullish", "caution"]),
-        "weeklyGrowth": round(random.uniform(5.0, 110.0), 1),
-        "redditMentions": random.randint(200, 5000),
-        "sentimentScore": random.randint(60, 95),
+        "imageUrl": PLACEHOLDER_IMAGE,
+        SCRAPED_IMAGE_FIELD: img,
+        "velocityScore": rng.randint(50, 99),
+        "saturationScore": rng.randint(10, 60),
+        "demandSignal": rng.choice(["bullish", "caution"]),
+        "weeklyGrowth": round(rng.uniform(5.0, 110.0), 1),
+        "redditMentions": rng.randint(200, 5000),
+        "sentimentScore": rng.randint(60, 95),
         "topRedditThemes": ["Viral", "Trending", "Hot"],
         "lastUpdated": "Live",
         "source": source,
-        "rating": round(random.uniform(3.8, 4.9), 1),
-        "reviewCount": random.randint(50, 10000),
-        "adSignal": random.choice(["high", "medium"]),
-        "social_signals": random.sample(["Instagram Reel", "TikTok Viral", "Google Search", "Fb Ads"], 2),
+        "rating": round(rng.uniform(3.8, 4.9), 1),
+        "reviewCount": rng.randint(50, 10000),
+        "adSignal": rng.choice(["high", "medium"]),
+        "social_signals": rng.sample(["Instagram Reel", "TikTok Viral", "Google Search", "Fb Ads"], 2),
         "faqs": [{"question": f"Is {name[:20]} trending?", "answer": "Yes, high search volume observed."}],
         "competitors": [],
         "redditThreads": []
@@ -153,7 +171,7 @@ def generate_smart_fill(category, limit=20):
         p_id = hashlib.md5(name.encode()).hexdigest()[:12]
         products.append(build_product(p_id, name, price, None, source, category))
         
-    return products
+    return resolve_product_images(products)
 
 def save_batch(products):
     """Save batch of products to Supabase"""
@@ -168,13 +186,28 @@ def save_batch(products):
     try:
         result = db.upsert_products(products)
         if result["success"]:
-            print(f"✅ Successfully saved {result.get('count', 0)} products to Supabase")
+            print(f"✅ Saved {result.get('count', 0)} products to Supabase, skipped {result.get('skipped', 0)} unchanged")
         else:
             print(f"❌ Error saving products: {result.get('error', 'Unknown error')}")
     except Exception as e:
         print(f"💥 Fatal DB Error in save_batch: {e}")
 
+def sync_category(category, products):
+    """Replace a category's stored products with a fresh scan, writing only the diff"""
+    db = get_db()
+    if not db.is_connected():
+        print("❌ Database not connected. Cannot sync category.")
+        return
+    
+    try:
+        result = db.sync_category_products(category, products)
+        if not result["success"]:
+            print(f"❌ Error syncing {category}: {result.get('error', 'Unknown error')}")
+    except Exception as e:
+        print(f"💥 Fatal DB Error in sync_category: {e}")
+
 # --- SCRAPERS WRAPPER ---
+# Registry only; each scraper is built the first time a request uses it
 scrapers = get_native_scrapers()
 
 def scrape_amazon_listing(query, category, limit=20):
@@ -267,6 +300,94 @@ def scrape_google_shopping_listing(query, category, limit=20):
 
 # --- AGGREGATOR TASK ---
 
+# Marketplace listing scrapers used by the deep scan, with their per-query limit
+DEEP_SCAN_MARKETPLACES = {
+    "amazon": (scrape_amazon_listing, 15),
+    "ebay": (scrape_ebay_listing, 15),
+    "google_shopping": (scrape_google_shopping_listing, 15),
+    "flipkart": (scrape_flipkart_listing, 10),
+}
+
+# Max in-flight queries per marketplace, e.g. DEEP_SCAN_AMAZON_CONCURRENCY=3
+MARKETPLACE_CONCURRENCY = {
+    name: int(os.environ.get(f"DEEP_SCAN_{name.upper()}_CONCURRENCY", default))
+    for name, default in {"amazon": 2, "ebay": 3, "google_shopping": 2, "flipkart": 2}.items()
+}
+
+# Categories merged, filled and saved in parallel
+DEEP_SCAN_CATEGORY_WORKERS = int(os.environ.get("DEEP_SCAN_CATEGORY_WORKERS", "4"))
+
+def deep_scan_queries(cat, trends):
+    # Diverse Scraping (Mixing Best, Worst, Middle)
+    queries = [
+        f"best {cat}",             # Trending/Top
+        f"trending {cat}",         # Hot
+        f"popular {cat}",          # Middle
+        f"cheap {cat}",            # Budget
+        f"luxury {cat}",           # Premium
+        f"new {cat}",              # New arrivals
+        f"worst rated {cat}"       # Low performers (to show "Skip" recommendations)
+    ]
+    
+    # Add dynamic trends if available
+    if trends:
+        queries.extend([f"{t} {cat}" for t in trends[:2]])
+    return queries
+
+def finish_category(cat, query_futures):
+    """
+    Merge one category's scrape results in query order, fill and save.
+    query_futures is [(query, [future per marketplace]), ...] in the original order,
+    so dedup and the 60-item cushion behave exactly like the serial scan.
+    """
+    print(f"\n📂 Processing Category: {cat.upper()}")
+    found_products = []
+    seen_names = set()
+    
+    for i, (q, futures) in enumerate(query_futures):
+        if len(found_products) >= 60: # Small cushion above 50
+            # Nothing left to wait for in this category
+            for _, rest in query_futures[i:]:
+                for f in rest: f.cancel()
+            break
+        
+        print(f"  🔍 Merging [ {q} ]...")
+        for f in futures:
+            for p in f.result():
+                if p["name"] not in seen_names:
+                    # Injected variability: randomizing scores slightly to ensure a mix
+                    # Some products get higher risk markers
+                    if "worst" in q.lower():
+                        p["velocityScore"] = random.randint(10, 30)
+                        p["demandSignal"] = "bearish"
+                    
+                    found_products.append(p)
+                    seen_names.add(p["name"])
+    
+    # Smart Fill if still below 50
+    if len(found_products) < 50: 
+        needed = 50 - len(found_products) 
+        print(f"  ⚠️ Yield low for {cat} ({len(found_products)} items). Filling {needed} more with AI Insight Engine...")
+        
+        # Use AI Fetcher
+        ai_data = scrapers["ai_fetcher"].fetch_trending_products(cat, limit=needed)
+        
+        for item in ai_data:
+            if item["name"] not in seen_names:
+                p_id = hashlib.md5(item["name"].encode()).hexdigest()[:10]
+                found_products.append(build_product(
+                    p_id, item["name"], item["price"], item["imageUrl"], "ai_insight", cat
+                ))
+                seen_names.add(item["name"])
+        
+    # Attach images in one batched pass
+    print(f"  🖼️ Resolving images for {len(found_products)} products...")
+    resolve_product_images(found_products)
+    
+    # Write only what changed; rows the scan no longer returned are removed
+    print(f"  💾 Syncing {len(found_products)} total products for {cat}...")
+    sync_category(cat, found_products)
+
 def run_deep_scan():
     print("🚀 Starting Deep Scan (Target: 50+ items/category)...")
     
@@ -281,72 +402,31 @@ def run_deep_scan():
         print(f"⚠️ Trends Error: {e}")
         trends = []
 
-    # 2. Iterate Categories with fallback
-    db = get_db()
-    for cat in CATEGORIES:
-        print(f"\n📂 Processing Category: {cat.upper()}")
-        # Clear existing products for this category to ensure "replacement"
-        db.clear_category_products(cat)
-        
-        # Step A: Diverse Scraping (Mixing Best, Worst, Middle)
-        queries = [
-            f"best {cat}",             # Trending/Top
-            f"trending {cat}",         # Hot
-            f"popular {cat}",          # Middle
-            f"cheap {cat}",            # Budget
-            f"luxury {cat}",           # Premium
-            f"new {cat}",              # New arrivals
-            f"worst rated {cat}"       # Low performers (to show "Skip" recommendations)
-        ]
-        
-        # Add dynamic trends if available
-        if trends:
-            queries.extend([f"{t} {cat}" for t in trends[:2]])
-            
-        found_products = []
-        seen_names = set()
-        
-        for q in queries:
-            if len(found_products) >= 60: break # Small cushion above 50
-            
-            print(f"  🔍 Scanning [ {q} ]...")
-            # Increased limits to hit the 50 mark faster
-            amz = scrape_amazon_listing(q, cat, limit=15)
-            ebay = scrape_ebay_listing(q, cat, limit=15)
-            gshop = scrape_google_shopping_listing(q, cat, limit=15)
-            fk = scrape_flipkart_listing(q, cat, limit=10)
-            
-            for p in (amz + ebay + gshop + fk):
-                if p["name"] not in seen_names:
-                    # Injected variability: randomizing scores slightly to ensure a mix
-                    # Some products get higher risk markers
-                    if "worst" in q.lower():
-                        p["velocityScore"] = random.randint(10, 30)
-                        p["demandSignal"] = "bearish"
-                    
-                    found_products.append(p)
-                    seen_names.add(p["name"])
+    # 2. Queue every (category, query, marketplace) scrape on its marketplace's pool.
+    # The pool size is the marketplace's concurrency limit.
+    pools = {
+        name: ThreadPoolExecutor(max_workers=MARKETPLACE_CONCURRENCY[name], thread_name_prefix=f"scan-{name}")
+        for name in DEEP_SCAN_MARKETPLACES
+    }
+    try:
+        plan = {}
+        for cat in CATEGORIES:
+            plan[cat] = [
+                (q, [pools[name].submit(fn, q, cat, limit) for name, (fn, limit) in DEEP_SCAN_MARKETPLACES.items()])
+                for q in deep_scan_queries(cat, trends)
+            ]
         
-        # Step B: Smart Fill if still below 50
-        if len(found_products) < 50: 
-            needed = 50 - len(found_products) 
-            print(f"  ⚠️ Yield low for {cat} ({len(found_products)} items). Filling {needed} more with AI Insight Engine...")
-            
-            # Use AI Fetcher
-            ai_data = scrapers["ai_fetcher"].fetch_trending_products(cat, limit=needed)
-            
-            for item in ai_data:
-                if item["name"] not in seen_names:
-                    p_id = hashlib.md5(item["name"].encode()).hexdigest()[:10]
-                    found_products.append(build_product(
-                        p_id, item["name"], item["price"], item["imageUrl"], "ai_insight", cat
-                    ))
-                    seen_names.add(item["name"])
-            
-        # Step C: Heavy Database Injection
-        print(f"  💾 Saving {len(found_products)} total products for {cat}...")
-        save_batch(found_products)
-        time.sleep(2) # Prevent rate limiting
+        # 3. Merge, fill and save categories as their scrapes land
+        with ThreadPoolExecutor(max_workers=DEEP_SCAN_CATEGORY_WORKERS, thread_name_prefix="scan-category") as category_pool:
+            jobs = {category_pool.submit(finish_category, cat, plan[cat]): cat for cat in CATEGORIES}
+            for job in as_completed(jobs):
+                try:
+                    job.result()
+                except Exception as e:
+                    print(f"❌ Deep scan failed for {jobs[job]}: {e}")
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
             
     print("\n✅ Deep scan completed successfully.")
 
@@ -361,8 +441,8 @@ async def refresh_data(background_tasks: BackgroundTasks):
         import modal
         print("☁️ Triggering Modal scheduled run from Render via lookup...")
         # Using Function.lookup is more reliable for hydrated remote calls
-        f = modal.Function.lookup("pickspy-scrapers", "scheduled_scrapers")
-        f.spawn()
+        f = await asyncio.to_thread(modal.Function.lookup, "pickspy-scrapers", "scheduled_scrapers")
+        await asyncio.to_thread(f.spawn)
         return {"status": "refreshing", "message": "Modal Cloud scrapers triggered. Database will update shortly."}
     except Exception as e:
         print(f"⚠️ Modal trigger failed: {e}")
@@ -375,8 +455,8 @@ async def trigger_deep_scan(background_tasks: BackgroundTasks):
     """Deep scan trigger - also prefers Modal"""
     try:
         import modal
-        f = modal.Function.lookup("pickspy-scrapers", "scheduled_scrapers")
-        f.spawn()
+        f = await asyncio.to_thread(modal.Function.lookup, "pickspy-scrapers", "scheduled_scrapers")
+        await asyncio.to_thread(f.spawn)
         return {"message": "Cloud deep scan started via Modal."}
     except Exception as e:
         print(f"⚠️ Modal deep-scan failed: {e}")
@@ -411,6 +491,13 @@ async def get_scraper_status():
             "sentiment_analysis": "active",
             "faqs": "active"
         },
+        "scrapers_built": scrapers.built(),
+        "search_cache": get_search_cache().stats(),
+        "image_cache": get_image_cache().stats(),
+        "prompt_cache": get_prompt_cache().stats(),
+        "analysis_cache": get_analysis_cache().stats(),
+        "product_writes": get_db().write_stats,
+        "activity_sink": get_db().activity.stats(),
         "note": "Using BeautifulSoup and Scrapy instead of ScrapingDog API"
     }
 
@@ -438,11 +525,11 @@ class ActivityTrackingRequest(BaseModel):
 @app.post("/user/save-product")
 async def save_product_endpoint(request: SaveProductRequest):
     """Save a product to user's favorites"""
-    db = get_db()
+    db = await get_async_db()
     if not db.is_connected():
         raise HTTPException(status_code=503, detail="Database not available")
     
-    result = db.save_product(request.user_id, request.product_id)
+    result = await db.save_product(request.user_id, request.product_id)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
     
@@ -452,11 +539,11 @@ async def save_product_endpoint(request: SaveProductRequest):
 @app.delete("/user/saved-product/{user_id}/{product_id}")
 async def remove_saved_product(user_id: str, product_id: str):
     """Remove a saved product"""
-    db = get_db()
+    db = await get_async_db()
     if not db.is_connected():
         raise HTTPException(status_code=503, detail="Database not available")
     
-    success = db.remove_saved_product(user_id, product_id)
+    success = await db.remove_saved_product(user_id, product_id)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to remove product")
     
@@ -466,25 +553,25 @@ async def remove_saved_product(user_id: str, product_id: str):
 @app.get("/user/saved-products/{user_id}")
 async def get_saved_products(user_id: str):
     """Get user's saved products"""
-    db = get_db()
+    db = await get_async_db()
     if not db.is_connected():
         raise HTTPException(status_code=503, detail="Database not available")
     
-    products = db.get_user_saved_products(user_id)
+    products = await db.get_user_saved_products(user_id)
     return {"user_id": user_id, "saved_products": products, "count": len(products)}
 
 
 @app.post("/user/create-comparison")
 async def create_comparison(request: ProductComparisonRequest):
     """Create a product comparison"""
-    db = get_db()
+    db = await get_async_db()
     if not db.is_connected():
         raise HTTPException(status_code=503, detail="Database not available")
     
     if not request.product_ids or len(request.product_ids) < 2:
         raise HTTPException(status_code=400, detail="At least 2 products required for comparison")
     
-    result = db.create_comparison(request.user_id, request.product_ids, request.notes)
+    result = await db.create_comparison(request.user_id, request.product_ids, request.notes)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
     
@@ -494,22 +581,22 @@ async def create_comparison(request: ProductComparisonRequest):
 @app.get("/user/comparisons/{user_id}")
 async def get_comparisons(user_id: str):
     """Get user's comparisons"""
-    db = get_db()
+    db = await get_async_db()
     if not db.is_connected():
         raise HTTPException(status_code=503, detail="Database not available")
     
-    comparisons = db.get_user_comparisons(user_id)
+    comparisons = await db.get_user_comparisons(user_id)
     return {"user_id": user_id, "comparisons": comparisons, "count": len(comparisons)}
 
 
 @app.post("/user/track-activity")
 async def track_activity(request: ActivityTrackingRequest):
     """Track user activity"""
-    db = get_db()
+    db = await get_async_db()
     if not db.is_connected():
         raise HTTPException(status_code=503, detail="Database not available")
     
-    success = db.track_user_activity(
+    success = await db.track_user_activity(
         request.user_id,
         request.activity_type,
         request.product_id,
@@ -525,11 +612,11 @@ async def track_activity(request: ActivityTrackingRequest):
 @app.get("/analytics/products")
 async def get_analytics():
     """Get product analytics"""
-    db = get_db()
+    db = await get_async_db()
     if not db.is_connected():
         raise HTTPException(status_code=503, detail="Database not available")
     
-    analytics = db.get_product_analytics(days=7)
+    analytics = await db.get_product_analytics(days=7)
     return analytics
 
 
@@ -537,15 +624,21 @@ async def get_analytics():
 async def get_product_analysis(product_name: str):
     """
     Get comprehensive live product analysis.
-    Favors Modal Cloud for high-reliability scraping.
+    Results are cached per normalized name, and concurrent requests for the
+    same product share one run.
     """
+    return await get_analysis_cache().get_or_compute(product_name, lambda: run_product_analysis(product_name))
+
+async def run_product_analysis(product_name: str):
+    """Live analysis run. Favors Modal Cloud for high-reliability scraping."""
     try:
         # Try Modal First
         try:
             import modal
             print(f"☁️ Using Modal Cloud for analysis of: {product_name}")
-            f = modal.Function.from_name("pickspy-scrapers", "run_product_analysis_on_modal")
-            result = f.remote(product_name)
+            analyzer = modal.Cls.from_name("pickspy-scrapers", "ProductAnalyzer")()
+            # Blocks until the remote run finishes; keep the event loop free meanwhile
+            result = await asyncio.to_thread(analyzer.analyze.remote, product_name)
             if result.get("success"):
                 return {"success": True, "data": result.get("data")}
             else:
@@ -554,97 +647,11 @@ async def get_product_analysis(product_name: str):
             print(f"⚠️ Modal Analysis Trigger failed: {modal_e}")
             
         # --- Fallback to Local (Render) Scrapers ---
-        scrapers = get_native_scrapers()
-        # ... (rest of the existing logic)
-        
         print(f"\n📊 Fetching comprehensive analysis for: {product_name}")
         
-        analysis = {
-            "product_name": product_name,
-            "timestamp": datetime.now().isoformat(),
-            "sources": {}
-        }
-        
-        # 1. Get market trends from Google Trends
-        print(f"  📈 Fetching market trends...")
-        try:
-            market_trends = scrapers["google_trends"].get_trends(product_name)
-            if market_trends:
-                analysis["sources"]["market_trends"] = market_trends
-        except Exception as e:
-            print(f"⚠️  Market trends fetch failed: {e}")
-        
-        # 2. Get social sentiment analysis
-        print(f"  📱 Fetching social content & sentiment...")
-        try:
-            sentiment = scrapers["sentiment"].get_product_sentiment(product_name)
-            if sentiment:
-                analysis["sources"]["social_analysis"] = sentiment
-                
-            # Fetch real Instagram posts
-            ig_posts = scrapers["instagram"].get_public_posts(product_name.replace(" ", ""))
-            if ig_posts:
-                if "social_analysis" not in analysis["sources"]:
-                    analysis["sources"]["social_analysis"] = {}
-                analysis["sources"]["social_analysis"]["instagram_posts"] = ig_posts
-        except Exception as e:
-            print(f"⚠️  Social analysis failed: {e}")
-        
-        # 3. Search ecommerce platforms (Walmart, eBay, Flipkart, Amazon)
-        print(f"  🛒 Fetching ecommerce data...")
-        ecommerce_data = {}
-        
-        try:
-            walmart_products = scrapers["walmart"].search(product_name, limit=5)
-            if walmart_products:
-                ecommerce_data["walmart"] = walmart_products[:3]
-        except Exception as e:
-            print(f"⚠️  Walmart fetch failed: {e}")
-        
-        try:
-            ebay_products = scrapers["ebay"].search(product_name, limit=5)
-            if ebay_products:
-                ecommerce_data["ebay"] = ebay_products[:3]
-        except Exception as e:
-            print(f"⚠️  eBay fetch failed: {e}")
-        
-        try:
-            flipkart_products = scrapers["flipkart"].search(product_name, limit=5)
-            if flipkart_products:
-                ecommerce_data["flipkart"] = flipkart_products[:3]
-        except Exception as e:
-            print(f"⚠️  Flipkart fetch failed: {e}")
-        
-        try:
-            amazon_products = scrapers["amazon"].search(product_name, limit=5)
-            if amazon_products:
-                ecommerce_data["amazon"] = amazon_products[:3]
-        except Exception as e:
-            print(f"⚠️  Amazon fetch failed: {e}")
-        
-        if ecommerce_data:
-            analysis["sources"]["ecommerce"] = ecommerce_data
-        
-        # 4. Get web search results
-        print(f"  🔎 Fetching web search data...")
-        try:
-            search_results = scrapers["google_search"].search(product_name, limit=20)
-            if search_results:
-                analysis["sources"]["search_results"] = {
-                    "total_results": len(search_results),
-                    "top_mentions": search_results[:5]
-                }
-        except Exception as e:
-            print(f"⚠️  Google search failed: {e}")
-        
-        # 5. Get FAQs
-        print(f"  ❓ Fetching FAQs...")
-        try:
-            faqs = scrapers["faqs"].get_faqs(product_name)
-            if faqs:
-                analysis["sources"]["faqs"] = faqs
-        except Exception as e:
-            print(f"⚠️  FAQ fetch failed: {e}")
+        # All sources are independent, so run them side by side and keep
+        # whatever finishes inside the latency budget
+        analysis = await collect_analysis(scrapers, product_name)
         
         print(f"✅ Comprehensive analysis complete for {product_name}")
         
@@ -663,12 +670,25 @@ async def get_product_analysis(product_name: str):
             "data": None
         }
 
+@app.get("/api/product-analysis/{product_name}/stream")
+async def stream_product_analysis(product_name: str):
+    """
+    Live product analysis as Server-Sent Events: each source is sent as soon
+    as it resolves, followed by a final event with the viability score.
+    """
+    print(f"\n📡 Streaming analysis for: {product_name}")
+    return StreamingResponse(
+        stream_analysis_events(scrapers, product_name),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
 @app.post("/api/ai/analyze")
 async def analyze_ai(request: AnalyzeRequest):
     """Analyze product viability using Pollinations.ai (Gemini 2.5 Flash Lite)"""
     try:
         print(f"🧠 Backend AI Analysis requested for: {request.productName}")
-        result = get_ai_analysis(request.productName, request.price, request.region)
+        result = await asyncio.to_thread(get_ai_analysis, request.productName, request.price, request.region)
         return {
             "success": True,
             "data": result
@@ -47,4 +47,50 @@ BEGIN
 END;
 $$
 LANGUAGE
-plpgsql; 
\ No newline at end of file
+plpgsql; 
+
+-- 4. Content hash for change detection
+-- upsert_products compares this against the incoming row and skips unchanged products
+ALTER TABLE public.products
+ADD COLUMN IF NOT EXISTS content_hash text;
+
+-- 5. Server-side activity analytics for /analytics/products
+-- Counts by type, day and product are aggregated in the database; the API only receives the summary
+CREATE OR REPLACE FUNCTION public.product_analytics(window_days integer default 7, top_n integer default 10)
+returns json as
+$$
+	with recent as (
+	    select activity_type, product_id, created_at
+	    from public.user_activity
+	    where created_at >= now() - make_interval(days => window_days)
+	)
+	select json_build_object(
+	    'total_products', (select count(*) from public.products),
+	    'activities', (select count(*) from recent),
+	    'by_type', coalesce((
+	        select json_object_agg(activity_type, n)
+	        from (select activity_type, count(*) as n from recent group by activity_type) t
+	    ), '{}'::json),
+	    'by_day', coalesce((
+	        select json_agg(json_build_object('day', day, 'count', n) order by day)
+	        from (select created_at::date as day, count(*) as n from recent group by 1) d
+	    ), '[]'::json),
+	    'top_products', coalesce((
+	        select json_agg(json_build_object('product_id', product_id, 'count', n) order by n desc)
+	        from (
+	            select product_id, count(*) as n from recent
+	            where product_id is not null
+	            group by product_id order by n desc limit top_n
+	        ) p
+	    ), '[]'::json)
+	);
+$$
+language
+sql stable
+
+security definer
+set search_path = public, pg_temp;
+
+-- Aggregates span every user's activity: only the API's service role may call it
+revoke execute on function public.product_analytics(integer, integer) from public, anon, authenticated;
+grant execute on function public.product_analytics(integer, integer) to service_role;
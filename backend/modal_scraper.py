@@ -1,9 +1,9 @@
 import modal
 import os
 import sys
-import subprocess
+import asyncio
+import importlib
 from typing import List, Optional, Dict, Any
-from datetime import datetime
 from pydantic import BaseModel
 from fastapi import FastAPI, HTTPException, Request
 
@@ -16,15 +16,17 @@ image = (
     modal.Image.debian_slim(python_version="3.11")
     .apt_install("libxml2-dev", "libxslt-dev", "libjpeg-dev", "zlib1g-dev", "gcc", "g++")
     .pip_install(
-        "scrapy",
+        "scrapy==2.11.0",
         "supabase",
         "fake-useragent",
         "requests",
+        "httpx",
         "python-dotenv",
         "pandas",
         "beautifulsoup4",
         "pytrends",
         "lxml",
+        "cssselect",
         "itemadapter",
         "scrapy-user-agents",
         "instagrapi",
@@ -34,20 +36,34 @@ image = (
     .add_local_dir(os.path.dirname(os.path.abspath(__file__)), remote_path="/root/backend", ignore=["venv", "__pycache__", ".git", ".env"])
 )
 
+# Inside a container the backend modules live here; add it to the path once
+# at import instead of in every handler
+BACKEND_DIR = "/root/backend"
+if os.path.isdir(BACKEND_DIR) and BACKEND_DIR not in sys.path:
+    sys.path.append(BACKEND_DIR)
+
+# Containers kept running while idle, so the first request after a quiet
+# spell skips the cold start (0 lets the endpoint scale to zero)
+API_MIN_CONTAINERS = int(os.environ.get("API_MIN_CONTAINERS", "1"))
+ANALYSIS_MIN_CONTAINERS = int(os.environ.get("ANALYSIS_MIN_CONTAINERS", "1"))
+# Start new containers from a memory snapshot taken after the heavy imports
+MODAL_MEMORY_SNAPSHOT = os.environ.get("MODAL_MEMORY_SNAPSHOT", "false").lower() == "true"
+
 @app.function(
     image=image,
     secrets=[modal.Secret.from_name("pickspy-secrets")],
     timeout=3600
 )
-def run_spider_on_modal(spider_name: str):
+def run_spider_on_modal(spider_name: str, spider_args: Optional[Dict[str, str]] = None):
+    """Crawl one spider in-process and return its stats (items, responses, errors, elapsed)"""
     import os
-    import subprocess
-    print(f"🕷️ Starting spider: {spider_name} on Modal...", flush=True)
+    import time
+    print(f"🕷️ Starting spider: {spider_name} {spider_args or ''} on Modal...", flush=True)
+    started = time.time()
     try:
         os.chdir("/root/backend")
         
         # Verify DB connection inside Modal
-        sys.path.append("/root/backend")
         from supabase_utils import get_db
         db = get_db()
         if db.is_connected():
@@ -57,44 +73,98 @@ def run_spider_on_modal(spider_name: str):
             print("❌ Supabase NOT connected from Modal remote!", flush=True)
             print(f"ENV URL: {os.environ.get('SUPABASE_URL')}", flush=True)
         
-        cmd = ["scrapy", "crawl", spider_name]
-        print(f"Running command: {' '.join(cmd)}", flush=True)
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"✅ Spider {spider_name} finished successfully.", flush=True)
-            return {"success": True, "log": result.stdout}
+        # Shares this container's reactor with any other crawl running here;
+        # progress is logged every SPIDER_LOGSTATS_INTERVAL seconds
+        from spider_runner import get_spider_runner
+        result = get_spider_runner().crawl(spider_name, spider_args)
+        if result["success"]:
+            print(f"✅ Spider {spider_name} finished successfully in {result['duration_s']}s.", flush=True)
         else:
-            print(f"❌ Spider {spider_name} failed.", flush=True)
-            return {"success": False, "error": result.stderr}
+            print(f"❌ Spider {spider_name} failed: {result['error'] or result['finish_reason']}", flush=True)
+        return result
     except Exception as e:
         print(f"Error running spider: {e}", flush=True)
-        return {"success": False, "error": str(e)}
+        return {"success": False, "spider": spider_name, "error": str(e), "duration_s": round(time.time() - started, 1)}
+
+@app.cls(
+    image=image,
+    secrets=[modal.Secret.from_name("pickspy-secrets")],
+    timeout=3600,
+    keep_warm=ANALYSIS_MIN_CONTAINERS,
+    enable_memory_snapshot=MODAL_MEMORY_SNAPSHOT
+)
+class ProductAnalyzer:
+    """Runs the GoogleProductInsightsAnalyzer on Modal, set up once per container"""
+
+    @modal.enter(snap=MODAL_MEMORY_SNAPSHOT)
+    def load(self):
+        # Imports only, so this part can be captured when snapshots are on
+        importlib.import_module("scrapers.spiders.product_insights_analyzer")
+
+    @modal.enter(snap=False)
+    def connect(self):
+        # Scrapers hold HTTP sessions, so they're built after any restore
+        from scrapers.spiders.product_insights_analyzer import get_product_insights_analyzer
+        self.analyzer = get_product_insights_analyzer()
+
+    @modal.method()
+    def analyze(self, product_query: str):
+        print(f"📊 Starting analysis for: {product_query}", flush=True)
+        try:
+            result = self.analyzer.get_comprehensive_product_analysis(product_query)
+            if result:
+                print(f"✅ Analysis for {product_query} completed.", flush=True)
+                return {"success": True, "data": result}
+            else:
+                print(f"❌ Analysis for {product_query} failed.", flush=True)
+                return {"success": False, "error": "Analyzer returned no results"}
+        except Exception as e:
+            print(f"💥 Error in analysis: {e}", flush=True)
+            return {"success": False, "error": str(e)}
+
+# Enrichment: products fetched per backlog page, products per container call,
+# max containers at once, and analyses in flight inside each container
+ENRICH_PAGE_SIZE = int(os.environ.get("ENRICH_PAGE_SIZE", "50"))
+ENRICH_BATCH_SIZE = int(os.environ.get("ENRICH_BATCH_SIZE", "5"))
+ENRICH_MAX_CONTAINERS = int(os.environ.get("ENRICH_MAX_CONTAINERS", "10"))
+ENRICH_WORKERS = int(os.environ.get("ENRICH_WORKERS", "4"))
+# Stop draining in time to write results before the function timeout
+ENRICH_TIME_BUDGET = float(os.environ.get("ENRICH_TIME_BUDGET", "3000"))
 
 @app.function(
     image=image,
     secrets=[modal.Secret.from_name("pickspy-secrets")],
-    timeout=3600
+    timeout=1800,
+    concurrency_limit=ENRICH_MAX_CONTAINERS
 )
-def run_product_analysis_on_modal(product_query: str):
-    """Runs the GoogleProductInsightsAnalyzer on Modal"""
-    import os
-    import sys
-    sys.path.append("/root/backend")
+def enrich_product_batch(products: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Analyze a few products side by side; returns rows ready to upsert plus the ids that failed"""
+    from concurrent.futures import ThreadPoolExecutor
     from scrapers.spiders.product_insights_analyzer import get_product_insights_analyzer
     
-    print(f"📊 Starting analysis for: {product_query}", flush=True)
-    try:
-        analyzer = get_product_insights_analyzer()
-        result = analyzer.get_comprehensive_product_analysis(product_query)
-        if result:
-            print(f"✅ Analysis for {product_query} completed.", flush=True)
-            return {"success": True, "data": result}
-        else:
-            print(f"❌ Analysis for {product_query} failed.", flush=True)
-            return {"success": False, "error": "Analyzer returned no results"}
-    except Exception as e:
-        print(f"💥 Error in analysis: {e}", flush=True)
-        return {"success": False, "error": str(e)}
+    analyzer = get_product_insights_analyzer()
+    
+    def analyze(p):
+        try:
+            print(f"🤖 Analyzing: {p['name']}", flush=True)
+            analysis = analyzer.get_comprehensive_product_analysis(p["name"])
+            if analysis:
+                return {
+                    "id": p["id"],
+                    "detailed_analysis": analysis,
+                    "sentiment_score": analysis.get("viability_score", 70) # Map to existing column
+                }
+            print(f"⚠️ No analysis results for {p['name']}", flush=True)
+        except Exception as e:
+            print(f"❌ Failed to enrich {p['name']}: {e}", flush=True)
+        return None
+    
+    with ThreadPoolExecutor(max_workers=ENRICH_WORKERS, thread_name_prefix="enrich") as pool:
+        results = list(pool.map(analyze, products))
+    return {
+        "rows": [row for row in results if row],
+        "failed": [p["id"] for p, row in zip(products, results) if not row]
+    }
 
 @app.function(
     image=image,
@@ -102,46 +172,112 @@ def run_product_analysis_on_modal(product_query: str):
     timeout=3600
 )
 def enrich_new_products():
-    """Finds products without analysis and enriches them with AI intelligence"""
-    import sys
-    sys.path.append("/root/backend")
+    """Drains the backlog of products without analysis, fanning batches out across containers"""
+    import time
     from supabase_utils import get_db
-    from scrapers.spiders.product_insights_analyzer import get_product_insights_analyzer
     
     db = get_db()
     print("🧠 Starting product enrichment task...", flush=True)
+    started = time.time()
+    summary = {"analyzed": 0, "written": 0, "missing": 0, "failed": 0, "pages": 0}
+    # Keyset cursor (created_at, id): failed products stay unanalyzed, so
+    # paging past them is what lets the loop end
+    cursor = None
     
-    # Get products without detailed analysis, priority to newest
     try:
-        response = db.client.table("products").select("*").is_("detailed_analysis", "null").order("created_at", desc=True).limit(50).execute()
-        products = response.data
-        if not products:
-            print("✨ No new products to enrich.", flush=True)
-            return
-        
-        print(f"🔬 Enrching {len(products)} products...", flush=True)
-        analyzer = get_product_insights_analyzer()
+        while time.time() - started < ENRICH_TIME_BUDGET:
+            # Newest first, as before
+            query = db.client.table("products").select("id,name,created_at").is_("detailed_analysis", "null")
+            if cursor:
+                query = query.or_(f'created_at.lt."{cursor[0]}",and(created_at.eq."{cursor[0]}",id.lt."{cursor[1]}")')
+            products = query.order("created_at", desc=True).order("id", desc=True).limit(ENRICH_PAGE_SIZE).execute().data
+            if not products:
+                break
+            cursor = (products[-1]["created_at"], products[-1]["id"])
+            summary["pages"] += 1
+            
+            batches = [
+                [{"id": p["id"], "name": p["name"]} for p in products[i:i + ENRICH_BATCH_SIZE]]
+                for i in range(0, len(products), ENRICH_BATCH_SIZE)
+            ]
+            print(f"🔬 Enriching {len(products)} products in {len(batches)} batches...", flush=True)
+            rows = []
+            for batch, outcome in zip(batches, enrich_product_batch.map(batches, return_exceptions=True)):
+                if isinstance(outcome, BaseException):
+                    print(f"❌ Enrichment batch failed: {outcome}", flush=True)
+                    summary["failed"] += len(batch)
+                    continue
+                rows.extend(outcome["rows"])
+                summary["failed"] += len(outcome["failed"])
+            
+            # Update by id rather than upsert: a product the scan deleted
+            # meanwhile must not come back as a stub
+            summary["analyzed"] += len(rows)
+            if rows:
+                result = db.update_rows("products", rows)
+                summary["written"] += result["written"]
+                summary["missing"] += result["missing"]
+        else:
+            print("⏳ Enrichment time budget spent; the rest waits for the next run.", flush=True)
         
-        for p in products:
-            try:
-                print(f"🤖 Analyzing: {p['name']}", flush=True)
-                analysis = analyzer.get_comprehensive_product_analysis(p['name'])
-                if analysis:
-                    # Update record with pre-generated analysis
-                    db.client.table("products").update({
-                        "detailed_analysis": analysis,
-                        "sentiment_score": analysis.get("viability_score", 70) # Map to existing column
-                    }).eq("id", p["id"]).execute()
-                else:
-                    print(f"⚠️ No analysis results for {p['name']}", flush=True)
-            except Exception as e:
-                print(f"❌ Failed to enrich {p['name']}: {e}", flush=True)
-                
-        print("✅ Enrichment task completed.", flush=True)
+        print(f"✅ Enrichment task completed: {summary}", flush=True)
     except Exception as e:
         print(f"💥 Enrichment Failed: {e}", flush=True)
+    return summary
 
 # --- SCHEDULING ---
+SCHEDULED_SPIDERS = ["amazon_bestsellers", "flipkart_trending", "ebay_search", "google_shopping"]
+# URLs or queries per container when a spider's work list is split up
+SPIDER_SHARD_SIZE = int(os.environ.get("SPIDER_SHARD_SIZE", "2"))
+
+def spider_shards(spiders: List[str], shard_size: int = SPIDER_SHARD_SIZE) -> List[tuple]:
+    """(spider_name, spider_args) per container, each spider's URL or query list cut into shards"""
+    from scrapers.spiders.products_spider import AmazonBestsellersSpider, FlipkartSpider
+    from scrapers.spiders.ebay_spider import EbaySpider
+    from scrapers.spiders.google_shopping_spider import GoogleShoppingSpider
+    
+    work = {
+        "amazon_bestsellers": ("urls", AmazonBestsellersSpider.default_urls),
+        "flipkart_trending": ("urls", FlipkartSpider.default_urls),
+        "ebay_search": ("queries", EbaySpider.default_queries.split(",")),
+        "google_shopping": ("queries", GoogleShoppingSpider.default_queries.split(",")),
+    }
+    shards = []
+    for spider in spiders:
+        if spider not in work:
+            shards.append((spider, None))
+            continue
+        arg, items = work[spider]
+        for i in range(0, len(items), shard_size):
+            shards.append((spider, {arg: ",".join(items[i:i + shard_size])}))
+    return shards
+
+def spider_run_report(shards: List[tuple], outcomes: List[Any], wall_time: float) -> Dict[str, Any]:
+    """One summary for a fanned-out run: per-spider shard results plus overall timing"""
+    spiders = {}
+    durations = []
+    for (spider, args), outcome in zip(shards, outcomes):
+        if isinstance(outcome, BaseException):
+            outcome = {"success": False, "error": str(outcome)}
+        entry = spiders.setdefault(spider, {"shards": 0, "succeeded": 0, "items_scraped": 0, "errors": [], "slowest_shard_s": 0.0})
+        entry["shards"] += 1
+        entry["items_scraped"] += outcome.get("items_scraped") or 0
+        duration = outcome.get("duration_s") or 0.0
+        durations.append(duration)
+        entry["slowest_shard_s"] = max(entry["slowest_shard_s"], duration)
+        if outcome.get("success"):
+            entry["succeeded"] += 1
+        else:
+            entry["errors"].append({"args": args, "error": str(outcome.get("error") or outcome.get("finish_reason"))[-500:]})
+    return {
+        "success": all(entry["succeeded"] == entry["shards"] for entry in spiders.values()),
+        "shards": len(shards),
+        "wall_time_s": round(wall_time, 1),
+        "slowest_shard_s": max(durations, default=0.0),
+        "items_scraped": sum(entry["items_scraped"] for entry in spiders.values()),
+        "spiders": spiders,
+    }
+
 # Automatically run every day at midnight (UTC)
 @app.function(
     image=image, 
@@ -151,22 +287,20 @@ def enrich_new_products():
 ) 
 def scheduled_scrapers():
     """Daily job to refresh all product data"""
-    import sys
-    sys.path.append("/root/backend")
+    import time
     from supabase_utils import get_db
     
-    spiders = ["amazon_bestsellers", "flipkart_trending", "ebay_search", "google_shopping"]
-    print(f"⏰ Starting scheduled maintenance run for {len(spiders)} spiders...", flush=True)
+    shards = spider_shards(SCHEDULED_SPIDERS)
+    print(f"⏰ Starting scheduled maintenance run: {len(SCHEDULED_SPIDERS)} spiders in {len(shards)} shards...", flush=True)
     
-    # 1. Run Spiders
-    results = {}
-    for spider in spiders:
-        try:
-            print(f"🔄 Running scheduled spider: {spider}", flush=True)
-            results[spider] = run_spider_on_modal.remote(spider)
-        except Exception as e:
-            print(f"❌ Scheduled spider {spider} failed: {e}", flush=True)
-            results[spider] = {"success": False, "error": str(e)}
+    # 1. Run every spider shard in its own container at once
+    started = time.time()
+    outcomes = list(run_spider_on_modal.starmap(shards, order_outputs=True, return_exceptions=True))
+    report = spider_run_report(shards, outcomes, time.time() - started)
+    for spider, entry in report["spiders"].items():
+        status = "✅" if entry["succeeded"] == entry["shards"] else "❌"
+        print(f"{status} {spider}: {entry['succeeded']}/{entry['shards']} shards, {entry['items_scraped']} items, slowest {entry['slowest_shard_s']}s", flush=True)
+    print(f"🏁 Spiders done in {report['wall_time_s']}s (slowest shard {report['slowest_shard_s']}s)", flush=True)
             
     # 2. Enrich products with AI (spawn background task)
     print("🚀 Triggering AI Enrichment for new products...", flush=True)
@@ -182,7 +316,7 @@ def scheduled_scrapers():
          print(f"❌ Cleanup failed: {e}", flush=True)
          
     print("✅ Scheduled maintenance run fully completed.", flush=True)
-    return results
+    return report
 
 # --- WEB API (REPLACING RENDER) ---
 from fastapi import FastAPI, BackgroundTasks, HTTPException
@@ -199,6 +333,24 @@ web_app.add_middleware(
     allow_headers=["*"],
 )
 
+@web_app.on_event("startup")
+async def open_async_db_client():
+    """Connect the async Supabase client on this container's event loop before traffic arrives"""
+    from supabase_async import get_async_db
+    await get_async_db()
+
+@web_app.on_event("shutdown")
+async def close_async_db_client():
+    """Release the pooled Supabase connections held by this container"""
+    from supabase_async import close_async_db
+    await close_async_db()
+
+@web_app.on_event("shutdown")
+async def flush_activity_sink():
+    """Write out activity events still queued in this container"""
+    from supabase_utils import get_db
+    await asyncio.to_thread(get_db().activity.close)
+
 # --- MODELS ---
 class SaveProductRequest(BaseModel):
     user_id: str
@@ -219,6 +371,7 @@ class AnalyzeRequest(BaseModel):
     productName: str
     price: str = "0"
     region: str = "Global"
+    userId: Optional[str] = None  # gates and tracks usage when present
 
 class SupportRequest(BaseModel):
     product: str
@@ -257,13 +410,14 @@ async def dodo_webhook(request: Request):
         
     print(f"💰 Webhook: Upgrading user {user_id} to {tier}...")
     
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
+    from supabase_async import get_async_db
     try:
-        db = get_db()
+        db = await get_async_db()
         # Update user tier in profiles table
-        db.client.table("profiles").update({"subscription_tier": tier}).eq("id", user_id).execute()
+        await db.set_user_tier(user_id, tier)
+        # Gate on the new tier right away instead of after the cache TTL
+        from quota import get_quota_service
+        get_quota_service().set_tier(user_id, tier)
         return {"status": "success", "user": user_id, "tier": tier}
     except Exception as e:
         print(f"❌ Webhook Error: {e}")
@@ -276,54 +430,74 @@ async def trigger_refresh(request: Request):
     # Optional: Restricted to Pro/Business only if triggered from UI
     # For now, let's keep it open but spawn daily anyway
     
-    scheduled_scrapers.spawn()
+    await asyncio.to_thread(scheduled_scrapers.spawn)
     
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
+    from supabase_async import get_async_db
     
     try:
-        db = get_db()
-        response = db.client.table("products").select("*").order("created_at", desc=True).limit(50).execute()
+        db = await get_async_db()
+        products = await db.get_recent_products(50)
         return {
             "status": "success", 
             "message": "Update started in cloud. Showing existing products...",
-            "products": response.data
+            "products": products
         }
     except:
         return {"status": "success", "message": "Scrapers started."}
 
 @web_app.get("/api/product-analysis/{product_name}")
 async def get_analysis(product_name: str):
-    """Deep product analysis endpoint"""
-    result = run_product_analysis_on_modal.remote(product_name)
-    return result
+    """Deep product analysis endpoint, cached per product and shared by concurrent viewers"""
+    from analysis_cache import get_analysis_cache
+    
+    # .remote blocks until the run finishes; keep the event loop free meanwhile
+    return await get_analysis_cache().get_or_compute(
+        product_name, lambda: asyncio.to_thread(ProductAnalyzer().analyze.remote, product_name)
+    )
+
+@web_app.get("/api/product-analysis/{product_name}/stream")
+async def stream_analysis(product_name: str):
+    """Live product analysis as Server-Sent Events, one event per source as it resolves"""
+    from fastapi.responses import StreamingResponse
+    from native_scrapers import get_native_scrapers
+    from live_analysis import stream_analysis_events, SSE_HEADERS
+
+    return StreamingResponse(
+        stream_analysis_events(get_native_scrapers(), product_name),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
 
 @web_app.post("/api/ai/analyze")
 async def analyze_ai(request: AnalyzeRequest):
     """AI Analysis endpoint with Plan-based gating"""
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
+    from supabase_async import get_async_db
+    from quota import get_quota_service
     
-    # Check Plan / Usage
+    # Check Plan / Usage: cached tier, use reserved (and logged) in user_activity
+    tier = "Unknown"
     if request.userId:
-        db = get_db()
-        tier = db.get_user_tier(request.userId)
-        
-        # Simple daily limit check for Free users
-        if tier == "Free":
-            today = datetime.now().date().isoformat()
-            activity = db.client.table("user_activity").select("id").eq("user_id", request.userId).eq("activity_type", "analyze").gte("created_at", today).execute()
-            if len(activity.data) >= 2:
-                raise HTTPException(status_code=403, detail="Free tier limit reached (2/day). Upgrade to Pro for unlimited AI insights!")
-
-    print(f"🧠 AI Analysis for: {request.productName} (Tier: {tier if 'tier' in locals() else 'Unknown'})")
-    result = run_product_analysis_on_modal.remote(request.productName)
+        db = await get_async_db()
+        quota = get_quota_service()
+        grant = await quota.acquire(db, request.userId, "analyze", metadata={"product": request.productName})
+        tier = grant["tier"]
+        if not grant["allowed"]:
+            raise HTTPException(status_code=403, detail="Free tier limit reached (2/day). Upgrade to Pro for unlimited AI insights!")
+
+    print(f"🧠 AI Analysis for: {request.productName} (Tier: {tier})")
+    try:
+        result = await asyncio.to_thread(ProductAnalyzer().analyze.remote, request.productName)
+    except Exception:
+        if request.userId:
+            await quota.release(db, grant)
+        raise
     
-    # Track the activity if user_id is present
-    if request.userId and result.get("success"):
-        db.track_user_activity(request.userId, "analyze", metadata={"product": request.productName})
+    # A quota reservation already logged the activity; failed runs don't use up quota
+    if request.userId:
+        if not result.get("success"):
+            await quota.release(db, grant)
+        elif not grant["reservation"]:
+            await db.track_user_activity(request.userId, "analyze", metadata={"product": request.productName})
         
     return result
 
@@ -336,7 +510,8 @@ async def submit_support(payload: SupportRequest):
     FORM_SECRET = os.environ.get("FORM_SECRET")
 
     try:
-        response = requests.post(
+        response = await asyncio.to_thread(
+            requests.post,
             SUPABASE_SUPPORT_URL,
             headers={
                 "Content-Type": "application/json",
@@ -364,10 +539,8 @@ async def submit_support(payload: SupportRequest):
 
 @web_app.get("/health")
 async def health():
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
-    db = get_db()
+    from supabase_async import get_async_db
+    db = await get_async_db()
     return {
         "status": "online", 
         "provider": "Modal", 
@@ -378,68 +551,54 @@ async def health():
 
 @web_app.post("/user/save-product")
 async def save_product(request: SaveProductRequest):
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
-    db = get_db()
-    result = db.save_product(request.user_id, request.product_id)
+    from supabase_async import get_async_db
+    db = await get_async_db()
+    result = await db.save_product(request.user_id, request.product_id)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
 
 @web_app.delete("/user/saved-product/{user_id}/{product_id}")
 async def remove_saved_product(user_id: str, product_id: str):
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
-    db = get_db()
-    success = db.remove_saved_product(user_id, product_id)
+    from supabase_async import get_async_db
+    db = await get_async_db()
+    success = await db.remove_saved_product(user_id, product_id)
     return {"success": success}
 
 @web_app.get("/user/saved-products/{user_id}")
 async def get_saved_products(user_id: str):
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
-    db = get_db()
-    products = db.get_user_saved_products(user_id)
+    from supabase_async import get_async_db
+    db = await get_async_db()
+    products = await db.get_user_saved_products(user_id)
     return {"user_id": user_id, "saved_products": products, "count": len(products)}
 
 @web_app.post("/user/track-activity")
 async def track_activity(request: ActivityTrackingRequest):
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
-    db = get_db()
-    success = db.track_user_activity(request.user_id, request.activity_type, request.product_id, request.metadata)
+    from supabase_async import get_async_db
+    db = await get_async_db()
+    success = await db.track_user_activity(request.user_id, request.activity_type, request.product_id, request.metadata)
     return {"success": success}
 
 @web_app.get("/analytics/products")
 async def get_analytics():
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
-    db = get_db()
-    return db.get_product_analytics(days=7)
+    from supabase_async import get_async_db
+    db = await get_async_db()
+    return await db.get_product_analytics(days=7)
 
 @web_app.post("/user/create-comparison")
 async def create_comparison(request: ProductComparisonRequest):
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
-    db = get_db()
-    result = db.create_comparison(request.user_id, request.product_ids, request.notes)
+    from supabase_async import get_async_db
+    db = await get_async_db()
+    result = await db.create_comparison(request.user_id, request.product_ids, request.notes)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
 
 @web_app.get("/user/comparisons/{user_id}")
 async def get_comparisons(user_id: str):
-    import sys
-    sys.path.append("/root/backend")
-    from supabase_utils import get_db
-    db = get_db()
-    comparisons = db.get_user_comparisons(user_id)
+    from supabase_async import get_async_db
+    db = await get_async_db()
+    comparisons = await db.get_user_comparisons(user_id)
     return {"user_id": user_id, "comparisons": comparisons, "count": len(comparisons)}
 
 @web_app.get("/api/scraper-status")
@@ -449,13 +608,33 @@ async def scraper_status():
         "scrapers": ["amazon", "ebay", "flipkart", "google_shopping", "trends", "sentiment"]
     }
 
-@app.function(
+@app.cls(
     image=image,
     secrets=[modal.Secret.from_name("pickspy-secrets")],
+    keep_warm=API_MIN_CONTAINERS,
+    enable_memory_snapshot=MODAL_MEMORY_SNAPSHOT
 )
-@modal.asgi_app()
-def api():
-    return web_app
+class Api:
+    """The web API; each container imports and connects once, before its first request"""
+
+    @modal.enter(snap=MODAL_MEMORY_SNAPSHOT)
+    def load(self):
+        # Imports only, so this part can be captured when snapshots are on
+        for module in ("supabase_utils", "supabase_async", "quota", "analysis_cache", "live_analysis", "native_scrapers"):
+            importlib.import_module(module)
+
+    @modal.enter(snap=False)
+    def connect(self):
+        # Clients and sessions hold sockets, so they're built after any restore
+        from supabase_utils import get_db
+        from native_scrapers import get_native_scrapers
+        get_db()
+        get_native_scrapers().warm()
+
+    # Label keeps the URL the old `api` function was served on
+    @modal.asgi_app(label="pickspy-scrapers-api")
+    def web(self):
+        return web_app
 
 @app.function(
     image=image,
@@ -465,8 +644,6 @@ def api():
 def test_db_func():
     """Test Supabase connection and write from Modal"""
     import os
-    import sys
-    sys.path.append("/root/backend")
     from supabase_utils import get_db
     db = get_db()
     
@@ -483,7 +660,7 @@ def test_db_func():
     }
     
     print("📝 Testing UPSERT...", flush=True)
-    result = db.upsert_products([test_product])
+    result = db.upsert_products([test_product], skip_unchanged=False)
     return result
 
 @app.local_entrypoint()
@@ -494,15 +671,16 @@ def main(spider_name: str = None, analyze: str = None, test_db: bool = False):
         print(f"Result: {ret}")
     elif analyze:
         print(f"🚀 Triggering Analysis for: {analyze}")
-        ret = run_product_analysis_on_modal.remote(analyze)
+        ret = ProductAnalyzer().analyze.remote(analyze)
         print(f"Result: {ret}")
     elif spider_name:
         print(f"🚀 Triggering Spider: {spider_name}")
         ret = run_spider_on_modal.remote(spider_name)
         if ret.get("success"):
-            print(f"✅ Spider Run Log:\n{ret.get('log')}")
+            print(f"✅ {spider_name}: {ret['items_scraped']} items, {ret['errors']} errors in {ret['elapsed_s']}s "
+                  f"({ret['responses']} responses, statuses {ret['status_counts']})")
         else:
-            print(f"❌ Spider failed: {ret.get('error')}")
+            print(f"❌ Spider failed: {ret.get('error') or ret.get('finish_reason')} after {ret.get('duration_s')}s")
         print(f"Result Recap: {ret}")
     else:
         print("💡 Please provide --spider-name or --analyze argument.")
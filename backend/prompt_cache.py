@@ -0,0 +1,98 @@
+"""
+Content-addressed cache of parsed LLM replies.
+Entries are keyed by (model, normalized prompt hash) with a TTL per use case.
+Past its TTL an entry stays servable for a stale window while one background
+refresh replaces it (stale-while-revalidate).
+"""
+
+import os
+import time
+import json
+import hashlib
+import tempfile
+import threading
+from typing import Optional, Any, Tuple
+
+from ttl_cache import TTLCache
+
+# Fresh lifetime per use case; unknown use cases get PROMPT_CACHE_DEFAULT_TTL
+PROMPT_CACHE_TTLS = {
+    "analysis": 6 * 3600,
+    "sentiment": 12 * 3600,
+    "faqs": 7 * 24 * 3600,
+    "features": 7 * 24 * 3600,
+    "competitiveness": 24 * 3600,
+    "insight": 24 * 3600,
+    "discovery": 6 * 3600,
+}
+PROMPT_CACHE_DEFAULT_TTL = float(os.environ.get("PROMPT_CACHE_DEFAULT_TTL", str(6 * 3600)))
+# How long past its TTL an entry is still served while a refresh runs
+PROMPT_CACHE_STALE_TTL = float(os.environ.get("PROMPT_CACHE_STALE_TTL", str(24 * 3600)))
+PROMPT_CACHE_MAX_BYTES = int(os.environ.get("PROMPT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+PROMPT_CACHE_PATH = os.environ.get("PROMPT_CACHE_PATH", os.path.join(tempfile.gettempdir(), "pickspy_prompt_cache.sqlite"))
+PROMPT_CACHE_ENABLED = os.environ.get("PROMPT_CACHE_ENABLED", "true").lower() != "false"
+
+
+def normalize_prompt(text: Optional[str]) -> str:
+    return " ".join(str(text or "").lower().split())
+
+
+class PromptCache(TTLCache):
+    """Parsed LLM replies keyed by (model, normalized prompt hash)"""
+
+    def __init__(self, max_bytes: int = PROMPT_CACHE_MAX_BYTES, path: Optional[str] = PROMPT_CACHE_PATH):
+        super().__init__(PROMPT_CACHE_DEFAULT_TTL, max_bytes, path, table="prompt_cache")
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, system: Optional[str] = None) -> str:
+        digest = hashlib.sha256(json.dumps([normalize_prompt(system), normalize_prompt(prompt)]).encode()).hexdigest()
+        return f"{model}|{digest}"
+
+    @staticmethod
+    def ttl_for(use_case: str) -> float:
+        return float(os.environ.get(f"PROMPT_CACHE_TTL_{use_case.upper()}", PROMPT_CACHE_TTLS.get(use_case, PROMPT_CACHE_DEFAULT_TTL)))
+
+    def lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        """(value, is_stale); value is None on a miss"""
+        entry = self.get(key)
+        if entry is None:
+            return None, False
+        return entry["value"], entry["fresh_until"] < time.time()
+
+    def store(self, key: str, value: Any, use_case: str):
+        ttl = self.ttl_for(use_case)
+        self.set(key, {"value": value, "fresh_until": time.time() + ttl}, ttl=ttl + PROMPT_CACHE_STALE_TTL)
+
+    def claim_refresh(self, key: str) -> bool:
+        """True for the one caller that should refresh a stale key"""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def release_refresh(self, key: str):
+        with self._refresh_lock:
+            self._refreshing.discard(key)
+
+    def stats(self):
+        stats = super().stats()
+        stats["stale_ttl_seconds"] = PROMPT_CACHE_STALE_TTL
+        stats["refreshing"] = len(self._refreshing)
+        return stats
+
+
+# Singleton instance
+_cache_instance = None
+_singleton_lock = threading.Lock()
+
+def get_prompt_cache() -> PromptCache:
+    """Get or create the shared LLM reply cache"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _singleton_lock:
+            if _cache_instance is None:
+                _cache_instance = PromptCache()
+    return _cache_instance
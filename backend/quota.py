@@ -0,0 +1,80 @@
+"""
+Plan-based usage gating for the AI endpoints.
+Subscription tiers are cached per user for QUOTA_TIER_TTL seconds (and
+replaced outright when the payment webhook upgrades someone). Daily usage
+is reserved against user_activity itself, so every worker and container
+shares one count; a use is allowed when its row ranks within the limit.
+"""
+
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any
+
+from ttl_cache import TTLCache
+
+QUOTA_TIER_TTL = float(os.environ.get("QUOTA_TIER_TTL", "120"))
+QUOTA_MAX_BYTES = int(os.environ.get("QUOTA_MAX_BYTES", str(1024 * 1024)))
+
+# Daily limits per tier and action; tiers or actions not listed are unlimited
+DAILY_LIMITS = {
+    "Free": {"analyze": 2},
+}
+
+
+class QuotaService:
+    """Cached tiers plus daily usage reservations, shared by one worker's requests"""
+
+    def __init__(self, tier_ttl: float = QUOTA_TIER_TTL, max_bytes: int = QUOTA_MAX_BYTES):
+        self._tiers = TTLCache(tier_ttl, max_bytes)
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now().date().isoformat()
+
+    async def get_tier(self, db, user_id: str) -> str:
+        tier = self._tiers.get(user_id)
+        if tier is None:
+            tier = await db.get_user_tier(user_id)
+            self._tiers.set(user_id, tier)
+        return tier
+
+    def set_tier(self, user_id: str, tier: str):
+        """Record a tier change (webhook upgrade) so gating sees it immediately"""
+        self._tiers.set(user_id, tier)
+
+    async def acquire(self, db, user_id: str, action: str, metadata: Dict = None) -> Dict[str, Any]:
+        """
+        Reserve one use of an action for today by logging it up front; the
+        logged activity is the usage record. Concurrent requests, on any
+        container, are ranked in the DB so they can't overshoot the limit.
+        Call release() with the grant if the action then fails.
+        """
+        tier = await self.get_tier(db, user_id)
+        limit = DAILY_LIMITS.get(tier, {}).get(action)
+        if limit is None:
+            return {"allowed": True, "tier": tier, "used": None, "limit": None, "reservation": None}
+        reservation = await db.reserve_user_activity(user_id, action, self.today(), limit, metadata)
+        if not reservation["allowed"]:
+            await db.delete_user_activity(reservation["id"])
+            return {"allowed": False, "tier": tier, "used": limit, "limit": limit, "reservation": None}
+        return {"allowed": True, "tier": tier, "used": reservation["used"], "limit": limit, "reservation": reservation["id"]}
+
+    async def release(self, db, grant: Dict[str, Any]):
+        """Give back a reservation whose action didn't go through"""
+        if grant.get("reservation"):
+            await db.delete_user_activity(grant["reservation"])
+
+
+# Singleton instance
+_quota_instance = None
+_singleton_lock = threading.Lock()
+
+def get_quota_service() -> QuotaService:
+    """Get or create this worker's quota service"""
+    global _quota_instance
+    if _quota_instance is None:
+        with _singleton_lock:
+            if _quota_instance is None:
+                _quota_instance = QuotaService()
+    return _quota_instance
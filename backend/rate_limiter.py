@@ -0,0 +1,156 @@
+"""
+Process-wide per-domain token-bucket rate limiter for the native scrapers.
+Requests only wait when their own host needs pacing, and hosts that answer
+429/503 are slowed down until they recover.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from typing import Optional, Dict, Tuple
+from urllib.parse import urlparse
+
+# Requests/second and burst size for hosts without an explicit rule
+DEFAULT_RATE = float(os.environ.get("SCRAPER_DEFAULT_RATE", "0.5"))
+DEFAULT_BURST = float(os.environ.get("SCRAPER_DEFAULT_BURST", "2"))
+
+# Host rules, matched on domain suffix. Override with
+# SCRAPER_RATE_LIMITS="amazon.com=0.4:2,ebay.com=1" (rate[:burst])
+DEFAULT_HOST_RATES = {
+    "amazon.com": (0.4, 2),
+    "google.com": (0.3, 1),
+    "walmart.com": (0.5, 2),
+    "flipkart.com": (0.5, 2),
+    "ebay.com": (1.0, 3),
+    "duckduckgo.com": (0.5, 2),
+}
+
+BACKOFF_STATUSES = (429, 503)
+MIN_RATE_FACTOR = 0.1     # never slow a host below 10% of its configured rate
+BASE_COOLDOWN = 5.0       # seconds paused after a 429/503 without Retry-After
+MAX_COOLDOWN = 120.0
+
+
+def _parse_host_rates(spec: str) -> Dict[str, Tuple[float, float]]:
+    rules = {}
+    for entry in spec.split(","):
+        if "=" not in entry:
+            continue
+        host, value = entry.split("=", 1)
+        rate, _, burst = value.partition(":")
+        try:
+            rules[host.strip().lower()] = (float(rate), float(burst) if burst else DEFAULT_BURST)
+        except ValueError:
+            print(f"⚠️ Ignoring bad rate limit rule: {entry}")
+    return rules
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.factor = 1.0          # adaptive multiplier on rate, lowered on 429/503
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.strikes = 0
+        self.backoffs = 0          # bumped by every 429/503, voids earlier reservations
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how long the caller must wait for it"""
+        rate = self.rate * self.factor
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+
+class DomainRateLimiter:
+    """Token buckets keyed by host, shared by threads and event loops"""
+
+    def __init__(self, host_rates: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.host_rates = dict(DEFAULT_HOST_RATES)
+        self.host_rates.update(host_rates or {})
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _rule_for(self, host: str) -> Tuple[float, float]:
+        for suffix, rule in self.host_rates.items():
+            if host == suffix or host.endswith("." + suffix):
+                return rule
+        return (DEFAULT_RATE, DEFAULT_BURST)
+
+    def _bucket(self, url: str) -> _Bucket:
+        host = urlparse(url).hostname or ""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(*self._rule_for(host))
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        return self._reserve(url)[0]
+
+    def _reserve(self, url: str) -> Tuple[float, int]:
+        with self._lock:
+            bucket = self._bucket(url)
+            return bucket.reserve(time.monotonic()), bucket.backoffs
+
+    def _backed_off_since(self, url: str, backoffs: int) -> bool:
+        with self._lock:
+            return self._bucket(url).backoffs != backoffs
+
+    def acquire(self, url: str):
+        """Block the calling thread until the host has a token"""
+        wait, backoffs = self._reserve(url)
+        # A 429/503 while we slept resets the bucket, so queue up again
+        while wait > 0:
+            time.sleep(wait)
+            if not self._backed_off_since(url, backoffs):
+                break
+            wait, backoffs = self._reserve(url)
+
+    async def acquire_async(self, url: str):
+        wait, backoffs = self._reserve(url)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            if not self._backed_off_since(url, backoffs):
+                break
+            wait, backoffs = self._reserve(url)
+
+    def record(self, url: str, status_code: int, retry_after: Optional[str] = None):
+        """Feed a response status back: back off on 429/503, recover slowly otherwise"""
+        with self._lock:
+            bucket = self._bucket(url)
+            if status_code in BACKOFF_STATUSES:
+                bucket.strikes += 1
+                bucket.backoffs += 1
+                bucket.factor = max(MIN_RATE_FACTOR, bucket.factor / 2)
+                try:
+                    cooldown = float(retry_after)
+                except (TypeError, ValueError):
+                    cooldown = BASE_COOLDOWN * (2 ** (bucket.strikes - 1))
+                bucket.blocked_until = time.monotonic() + min(cooldown, MAX_COOLDOWN)
+                # One token left as of the end of the cooldown, so queued callers resume staggered
+                bucket.tokens = 1
+                bucket.updated = bucket.blocked_until
+                print(f"🐢 {urlparse(url).hostname} answered {status_code}, pacing at {bucket.rate * bucket.factor:.2f} req/s")
+            elif status_code < 400:
+                bucket.strikes = 0
+                bucket.factor = min(1.0, bucket.factor + 0.1)
+
+
+# Singleton instance
+_limiter_instance = None
+_singleton_lock = threading.Lock()
+
+def get_rate_limiter() -> DomainRateLimiter:
+    """Get or create the shared per-domain limiter"""
+    global _limiter_instance
+    if _limiter_instance is None:
+        # Deep-scan worker threads may race for the first instance
+        with _singleton_lock:
+            if _limiter_instance is None:
+                _limiter_instance = DomainRateLimiter(_parse_host_rates(os.environ.get("SCRAPER_RATE_LIMITS", "")))
+    return _limiter_instance
@@ -10,15 +10,20 @@ if backend_dir not in sys.path:
 
 try:
     # If running from backend directory
-    from supabase_utils import get_db
+    from supabase_utils import get_db, SUPABASE_WRITE_CHUNK_SIZE, SUPABASE_WRITE_CONCURRENCY
 except ImportError:
     # If running from parent directory or installed as package
     try:
-        from backend.supabase_utils import get_db
+        from backend.supabase_utils import get_db, SUPABASE_WRITE_CHUNK_SIZE, SUPABASE_WRITE_CONCURRENCY
     except ImportError:
         # Fallback if needed
         import supabase_utils
         get_db = supabase_utils.get_db
+        SUPABASE_WRITE_CHUNK_SIZE = supabase_utils.SUPABASE_WRITE_CHUNK_SIZE
+        SUPABASE_WRITE_CONCURRENCY = supabase_utils.SUPABASE_WRITE_CONCURRENCY
+
+# Enough rows per flush to keep every concurrent chunk writer busy
+PIPELINE_BATCH_SIZE = int(os.environ.get("PIPELINE_BATCH_SIZE", str(SUPABASE_WRITE_CHUNK_SIZE * SUPABASE_WRITE_CONCURRENCY)))
 
 class SupabasePipeline:
     def __init__(self):
@@ -26,20 +31,11 @@ class SupabasePipeline:
         self.items_buffer = []
 
     def process_item(self, item, spider):
-        # Buffer items to batch insert if needed, 
-        # but supabase_utils.upsert_products already handles batching logic if passed a list.
-        # However, Scrapy pipelines process one item at a time.
-        
-        # We can either insert one by one or buffer.
-        # Given supabase_utils.upsert_products takes a list, let's buffer a bit or just wrap locally.
-        # But wait, supabase_utils.upsert_products chunks internally by 50. 
-        # So we should probably accumulate items and flush on close, 
-        # OR just call upsert for single items.
-        
-        # Upserting one by one is slow. Let's buffer.
+        # Scrapy hands over one item at a time; buffer them so upsert_products
+        # can write several chunks in parallel per flush
         self.items_buffer.append(item)
         
-        if len(self.items_buffer) >= 50:
+        if len(self.items_buffer) >= PIPELINE_BATCH_SIZE:
             self._flush()
             
         return item
@@ -47,6 +43,8 @@ class SupabasePipeline:
     def close_spider(self, spider):
         if self.items_buffer:
             self._flush()
+        stats = self.db.write_stats
+        print(f"📊 Pipeline: {stats['written']} rows written, {stats['skipped']} unchanged skipped, {stats['touched']} touched")
 
     def _flush(self):
         if not self.items_buffer:
@@ -56,7 +54,9 @@ class SupabasePipeline:
         try:
             result = self.db.upsert_products(self.items_buffer)
             if result.get('success'):
-                print(f"✅ Pipeline: Saved {result.get('count', 0)} items.")
+                print(f"✅ Pipeline: Saved {result.get('count', 0)} items, skipped {result.get('skipped', 0)} unchanged.")
+                if result.get('failed'):
+                    print(f"⚠️ Pipeline: {result['failed']} items rejected: {result['failed_ids']}")
             else:
                 print(f"❌ Pipeline: Failed to save items. Error: {result.get('error')}")
             self.items_buffer = []
@@ -12,8 +12,10 @@ class EbaySpider(scrapy.Spider):
         'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
 
+    default_queries = 'laptop,phone'
+
     def start_requests(self):
-        queries = getattr(self, 'queries', 'laptop,phone').split(',')
+        queries = getattr(self, 'queries', self.default_queries).split(',')
         for q in queries:
             url = f"https://www.ebay.com/sch/i.html?_nkw={q.replace(' ', '+')}&_ipg=200"
             yield scrapy.Request(url, callback=self.parse, meta={'query': q})
@@ -24,7 +26,8 @@ class EbaySpider(scrapy.Spider):
         
         for p in products:
             try:
-                title = p.css('.s-item__title::text').get()
+                # The title text sits in a nested <span role="heading">
+                title = p.css('.s-item__title').xpath('normalize-space(string())').get()
                 price = p.css('.s-item__price::text').get()
                 link = p.css('.s-item__link::attr(href)').get()
                 img = p.css('.s-item__image-img::attr(src)').get()
@@ -11,8 +11,10 @@ class GoogleShoppingSpider(scrapy.Spider):
         'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
 
+    default_queries = 'shoes'
+
     def start_requests(self):
-        queries = getattr(self, 'queries', 'shoes').split(',')
+        queries = getattr(self, 'queries', self.default_queries).split(',')
         for q in queries:
             url = f"https://www.google.com/search?q={q.replace(' ', '+')}&tbm=shop&hl=en"
             yield scrapy.Request(url, callback=self.parse, meta={'query': q})
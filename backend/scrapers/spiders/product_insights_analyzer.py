@@ -1,10 +1,9 @@
 """
 Google Immersive Product Analyzer - Fetches detailed product insights and analysis
 """
-import requests
 import os
-import random
 import time
+import threading
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from bs4 import BeautifulSoup
@@ -12,10 +11,14 @@ from urllib.parse import quote
 
 # Import native scrapers
 try:
-    from native_scrapers import get_native_scrapers, GoogleSearchScraper, GoogleTrendsScraper, POLLINATIONS_API_KEY, AI_MODEL
+    from native_scrapers import get_native_scrapers, GoogleSearchScraper, GoogleTrendsScraper
+    from llm_client import get_llm_client
+    from live_analysis import quality_score as compute_quality_score
 except ImportError:
     # Fallback for relative import if running as package
-    from ...native_scrapers import get_native_scrapers, GoogleSearchScraper, GoogleTrendsScraper, POLLINATIONS_API_KEY, AI_MODEL
+    from ...native_scrapers import get_native_scrapers, GoogleSearchScraper, GoogleTrendsScraper
+    from ...llm_client import get_llm_client
+    from ...live_analysis import quality_score as compute_quality_score
 import json
 
 class GoogleProductInsightsAnalyzer:
@@ -60,38 +63,19 @@ class GoogleProductInsightsAnalyzer:
                 print("🤖 All scrapers blocked. Generating AI synthetic product info via Pollinations.ai...")
                 try:
                     prompt = f"Generate a realistic product specification and market report for '{product_query}'. Return ONLY a JSON object: {{\"title\": \"...\", \"description\": \"...\", \"price\": 0.0, \"rating\": 4.5, \"reviews_count\": 100}}"
-                    
-                    headers = {"Content-Type": "application/json"}
-                    if POLLINATIONS_API_KEY:
-                        headers["Authorization"] = f"Bearer {POLLINATIONS_API_KEY}"
-
-                    res = requests.post(
-                        "https://text.pollinations.ai/",
-                        headers=headers,
-                        json={
-                            "model": AI_MODEL,
-                            "messages": [{"role": "user", "content": prompt}],
-                            "jsonMode": True
-                        },
-                        timeout=10
-                    )
-                    if res.status_code == 200:
-                        ai_res = res.text
-                        import re
-                        match = re.search(r'\{.*\}', ai_res, re.DOTALL)
-                        if match:
-                            ai_data = json.loads(match.group())
-                            return {
-                                "title": ai_data.get("title", product_query),
-                                "description": ai_data.get("description", "Premium trending product."),
-                                "price": ai_data.get("price", 49.99),
-                                "currency": "USD",
-                                "rating": ai_data.get("rating", 4.5),
-                                "reviews_count": ai_data.get("reviews_count", 150),
-                                "url": f"https://www.google.com/search?q={quote(product_query)}",
-                                "source": "ai_synthetic",
-                                "product_id": str(hash(product_query))
-                            }
+                    ai_data = get_llm_client().complete_json(prompt, timeout=10, use_case="insight")
+                    if ai_data:
+                        return {
+                            "title": ai_data.get("title", product_query),
+                            "description": ai_data.get("description", "Premium trending product."),
+                            "price": ai_data.get("price", 49.99),
+                            "currency": "USD",
+                            "rating": ai_data.get("rating", 4.5),
+                            "reviews_count": ai_data.get("reviews_count", 150),
+                            "url": f"https://www.google.com/search?q={quote(product_query)}",
+                            "source": "ai_synthetic",
+                            "product_id": str(hash(product_query))
+                        }
                 except: pass
 
             if not search_results:
@@ -176,27 +160,9 @@ class GoogleProductInsightsAnalyzer:
                     f"Extract key specifications and highlights for this product based on its description: '{desc}'. "
                     "Format as a JSON: {\"key_specs\": [\"...\"], \"highlights\": [\"...\"]}"
                 )
-                
-                headers = {"Content-Type": "application/json"}
-                if POLLINATIONS_API_KEY:
-                    headers["Authorization"] = f"Bearer {POLLINATIONS_API_KEY}"
-
-                res = requests.post(
-                    "https://text.pollinations.ai/",
-                    headers=headers,
-                    json={
-                        "model": AI_MODEL,
-                        "messages": [{"role": "user", "content": prompt}],
-                        "jsonMode": True
-                    },
-                    timeout=10
-                )
-                if res.status_code == 200:
-                    ai_res = res.text
-                    import re
-                    match = re.search(r'\{.*\}', ai_res, re.DOTALL)
-                    if match:
-                        return json.loads(match.group())
+                features = get_llm_client().complete_json(prompt, timeout=10, use_case="features")
+                if features:
+                    return features
             except: pass
 
         return {
@@ -217,27 +183,9 @@ class GoogleProductInsightsAnalyzer:
                 f"Competitors: {comp_data}. "
                 "Provide a JSON with: 'market_position' (string), 'advantages' (list), 'disadvantages' (list)."
             )
-            
-            headers = {"Content-Type": "application/json"}
-            if POLLINATIONS_API_KEY:
-                headers["Authorization"] = f"Bearer {POLLINATIONS_API_KEY}"
-
-            res = requests.post(
-                "https://text.pollinations.ai/",
-                headers=headers,
-                json={
-                    "model": AI_MODEL,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "jsonMode": True
-                },
-                timeout=10
-            )
-            if res.status_code == 200:
-                ai_res = res.text
-                import re
-                match = re.search(r'\{.*\}', ai_res, re.DOTALL)
-                if match:
-                    return json.loads(match.group())
+            competitiveness = get_llm_client().complete_json(prompt, timeout=10, use_case="competitiveness")
+            if competitiveness:
+                return competitiveness
         except: pass
 
         # Simple logic based on price comparison fallback
@@ -333,34 +281,8 @@ class GoogleProductInsightsAnalyzer:
             except Exception as e:
                 print(f"⚠️ FAQ fetch error: {e}", flush=True)
 
-            # 6. Calc Quality Score based on data
-            quality_score = 6.5 + random.uniform(0, 1.5) # Dynamic base
-            
-            # Trend impact
-            trend_dir = market_trends.get("trend_direction", "neutral")
-            if trend_dir == "up": quality_score += 1.2
-            elif trend_dir == "down": quality_score -= 1.0
-            
-            # Velocity impact (0-100 scale usually)
-            velocity = market_trends.get("trend_velocity_percent", 50)
-            if velocity > 70: quality_score += 0.8
-            elif velocity < 30: quality_score -= 0.5
-            
-            # Social Sentiment impact
-            sentiment = social_analysis.get("sentiment_percentage", {}).get("positive", 50)
-            if sentiment > 75: quality_score += 1.5
-            elif sentiment < 40: quality_score -= 1.5
-            
-            # Mention volume impact
-            mentions = social_analysis.get("total_mentions", 0)
-            if mentions > 1000: quality_score += 0.5
-            
-            # Ecommerce presence
-            if ecommerce.get("amazon"): quality_score += 0.3
-            if ecommerce.get("ebay") or ecommerce.get("walmart"): quality_score += 0.2
-            
-            # Normalize to 0-10 range
-            quality_score = max(1.0, min(9.8, quality_score))
+            # 6. Calc Quality Score based on data (same scoring as the live fan-out)
+            quality_score = compute_quality_score(market_trends, social_analysis, ecommerce)
 
             # Combine in THE format expected by ProductDetail.tsx
             analysis = {
@@ -480,6 +402,15 @@ class GoogleProductInsightsAnalyzer:
             return None
 
 
+# Singleton instance
+_analyzer_instance = None
+_singleton_lock = threading.Lock()
+
 def get_product_insights_analyzer() -> GoogleProductInsightsAnalyzer:
     """Get or create product insights analyzer instance"""
-    return GoogleProductInsightsAnalyzer()
+    global _analyzer_instance
+    if _analyzer_instance is None:
+        with _singleton_lock:
+            if _analyzer_instance is None:
+                _analyzer_instance = GoogleProductInsightsAnalyzer()
+    return _analyzer_instance
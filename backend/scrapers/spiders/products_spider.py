@@ -17,18 +17,22 @@ class AmazonBestsellersSpider(scrapy.Spider):
         'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
     
+    # Targeting specific best seller nodes
+    default_urls = [
+        'https://www.amazon.com/Best-Sellers-Electronics/zgbs/electronics',
+        'https://www.amazon.com/Best-Sellers-Home-Kitchen/zgbs/home-garden',
+        'https://www.amazon.com/Best-Sellers-Beauty/zgbs/beauty',
+        'https://www.amazon.com/Best-Sellers-Clothing-Shoes-Jewelry/zgbs/fashion',
+        'https://www.amazon.com/Best-Sellers-Sports-Outdoors/zgbs/sports',
+        'https://www.amazon.com/Best-Sellers-Toys-Games/zgbs/toys',
+        'https://www.amazon.com/Best-Sellers-Automotive/zgbs/automotive',
+        'https://www.amazon.com/Best-Sellers-Pet-Supplies/zgbs/pet-supplies',
+    ]
+    
     def start_requests(self):
-        # Targeting specific best seller nodes
-        urls = [
-            'https://www.amazon.com/Best-Sellers-Electronics/zgbs/electronics',
-            'https://www.amazon.com/Best-Sellers-Home-Kitchen/zgbs/home-garden',
-            'https://www.amazon.com/Best-Sellers-Beauty/zgbs/beauty',
-            'https://www.amazon.com/Best-Sellers-Clothing-Shoes-Jewelry/zgbs/fashion',
-            'https://www.amazon.com/Best-Sellers-Sports-Outdoors/zgbs/sports',
-            'https://www.amazon.com/Best-Sellers-Toys-Games/zgbs/toys',
-            'https://www.amazon.com/Best-Sellers-Automotive/zgbs/automotive',
-            'https://www.amazon.com/Best-Sellers-Pet-Supplies/zgbs/pet-supplies',
-        ]
+        # -a urls=a,b runs a subset (one shard of a fanned-out run)
+        urls = getattr(self, 'urls', None)
+        urls = urls.split(',') if urls else self.default_urls
         for url in urls:
             yield scrapy.Request(url=url, callback=self.parse)
     
@@ -39,7 +43,7 @@ class AmazonBestsellersSpider(scrapy.Spider):
             name = item.css('span.zg-text-center-align::text, span.a-size-small::text, div._cDEzb_p13n-sc-css-line-clamp-3_g3dy1::text').get()
             
             # Price extraction (resilient)
-            price_whole = item.css('span.a-price-whole::text, span._cDEzb_p13n-sc-price::text').get()
+            price_whole = item.css('span.a-price-whole::text, span[class*="p13n-sc-price"]::text').get()
             price_fraction = item.css('span.a-price-fraction::text').get()
             price = 0
             if price_whole:
@@ -84,11 +88,14 @@ class FlipkartSpider(scrapy.Spider):
         'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
     
+    default_urls = [
+        'https://www.flipkart.com/search?q=best+selling+electronics&otracker=search',
+        'https://www.flipkart.com/search?q=trending+home+decor&otracker=search',
+    ]
+    
     def start_requests(self):
-        urls = [
-            'https://www.flipkart.com/search?q=best+selling+electronics&otracker=search',
-            'https://www.flipkart.com/search?q=trending+home+decor&otracker=search',
-        ]
+        urls = getattr(self, 'urls', None)
+        urls = urls.split(',') if urls else self.default_urls
         for url in urls:
             yield scrapy.Request(url=url, callback=self.parse)
             
@@ -19,7 +19,8 @@ class GoogleTrendsSpider(scrapy.Spider):
     def parse(self, response):
         for item in response.xpath('//item'):
             title = item.xpath('title/text()').get()
-            traffic = item.xpath('ht:approx_traffic/text()').get()
+            # ht: is a namespace prefix the feed declares; match on the local name
+            traffic = item.xpath("*[local-name()='approx_traffic']/text()").get()
             if title:
                 yield {
                     'keyword': title.strip(),
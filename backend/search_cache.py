@@ -0,0 +1,92 @@
+"""
+TTL cache for parsed marketplace search results.
+Entries are keyed by (scraper, normalized query, limit) and kept in a
+size-capped in-memory LRU, with an optional SQLite file as a durable tier.
+"""
+
+import os
+import threading
+import functools
+import inspect
+from typing import Optional
+
+from ttl_cache import TTLCache
+
+SEARCH_CACHE_TTL = float(os.environ.get("SEARCH_CACHE_TTL", str(6 * 3600)))
+SEARCH_CACHE_MAX_BYTES = int(os.environ.get("SEARCH_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# Set to a file path (e.g. /tmp/pickspy_search_cache.sqlite) to keep results across restarts
+SEARCH_CACHE_PATH = os.environ.get("SEARCH_CACHE_PATH")
+SEARCH_CACHE_ENABLED = os.environ.get("SEARCH_CACHE_ENABLED", "true").lower() != "false"
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(str(query).lower().split())
+
+
+class SearchCache(TTLCache):
+    """Search results keyed by (scraper, normalized query, limit)"""
+
+    def __init__(self, ttl: float = SEARCH_CACHE_TTL, max_bytes: int = SEARCH_CACHE_MAX_BYTES, path: Optional[str] = SEARCH_CACHE_PATH):
+        super().__init__(ttl, max_bytes, path, table="search_cache")
+
+    @staticmethod
+    def make_key(scraper: str, query: str, limit: int) -> str:
+        return f"{scraper}|{normalize_query(query)}|{limit}"
+
+
+# Singleton instance
+_cache_instance = None
+_singleton_lock = threading.Lock()
+
+def get_search_cache() -> SearchCache:
+    """Get or create the shared search result cache"""
+    global _cache_instance
+    if _cache_instance is None:
+        # Deep-scan worker threads may race for the first instance
+        with _singleton_lock:
+            if _cache_instance is None:
+                _cache_instance = SearchCache()
+    return _cache_instance
+
+
+def cached_search(method):
+    """
+    Cache a scraper's search(query, limit) / search_async(query, limit) by
+    (scraper class, normalized query, limit). Sync and async twins share entries.
+    Empty or failed results are not cached.
+    """
+    default_limit = inspect.signature(method).parameters["limit"].default
+
+    def _key(self, query, limit):
+        return SearchCache.make_key(type(self).__name__, query, default_limit if limit is None else limit)
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, query, limit=None):
+            if not SEARCH_CACHE_ENABLED:
+                return await method(self, query, default_limit if limit is None else limit)
+            cache = get_search_cache()
+            key = _key(self, query, limit)
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
+            result = await method(self, query, default_limit if limit is None else limit)
+            if result:
+                cache.set(key, result)
+            return result
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, query, limit=None):
+        if not SEARCH_CACHE_ENABLED:
+            return method(self, query, default_limit if limit is None else limit)
+        cache = get_search_cache()
+        key = _key(self, query, limit)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+        result = method(self, query, default_limit if limit is None else limit)
+        if result:
+            cache.set(key, result)
+        return result
+    return wrapper
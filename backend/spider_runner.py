@@ -0,0 +1,115 @@
+"""
+In-process Scrapy runner.
+One Twisted reactor runs in a background thread for the life of the
+process, and every crawl is scheduled onto it through a shared
+CrawlerRunner. Spiders in the same container share the reactor and the
+imported project, and a warm container can crawl again (a reactor can't be
+restarted, so CrawlerProcess.start() only works once per process).
+"""
+
+import os
+import sys
+import time
+import threading
+from concurrent.futures import Future
+from typing import Dict, Any, Optional
+
+from scrapy.crawler import CrawlerRunner
+from scrapy.utils.log import configure_logging
+from scrapy.utils.project import get_project_settings
+from scrapy.utils.reactor import install_reactor
+
+# Crawl progress (pages, items, rates) goes to the log this often
+SPIDER_LOGSTATS_INTERVAL = float(os.environ.get("SPIDER_LOGSTATS_INTERVAL", "30"))
+
+
+def crawl_summary(spider_name: str, stats: Dict[str, Any], duration: float, error: Optional[str] = None) -> Dict[str, Any]:
+    """Structured result from a crawler's stats collector"""
+    statuses = {
+        key.rsplit("/", 1)[-1]: value for key, value in stats.items()
+        if key.startswith("downloader/response_status_count/")
+    }
+    errors = stats.get("log_count/ERROR", 0) + stats.get("spider_exceptions", 0)
+    finish_reason = stats.get("finish_reason")
+    return {
+        "success": error is None and finish_reason == "finished",
+        "spider": spider_name,
+        "items_scraped": stats.get("item_scraped_count", 0),
+        "items_dropped": stats.get("item_dropped_count", 0),
+        "requests": stats.get("downloader/request_count", 0),
+        "responses": stats.get("response_received_count", 0),
+        "status_counts": statuses,
+        "retries": stats.get("retry/count", 0),
+        "errors": errors,
+        "download_errors": stats.get("downloader/exception_count", 0),
+        "finish_reason": finish_reason,
+        "elapsed_s": round(stats.get("elapsed_time_seconds", duration), 1),
+        "duration_s": round(duration, 1),
+        "error": error,
+    }
+
+
+class SpiderRunner:
+    """Runs project spiders on one long-lived reactor thread"""
+
+    def __init__(self):
+        settings = get_project_settings()
+        settings.set("LOGSTATS_INTERVAL", SPIDER_LOGSTATS_INTERVAL, priority="cmdline")
+        configure_logging(settings)
+        # CrawlerRunner checks for the configured reactor (asyncio by default in
+        # newer Scrapy) but, unlike CrawlerProcess, never installs it
+        reactor_path = settings.get("TWISTED_REACTOR")
+        if reactor_path and "twisted.internet.reactor" not in sys.modules:
+            install_reactor(reactor_path, settings.get("ASYNCIO_EVENT_LOOP"))
+        self.runner = CrawlerRunner(settings)
+        from twisted.internet import reactor
+        self.reactor = reactor
+        self._thread = threading.Thread(
+            target=reactor.run, kwargs={"installSignalHandlers": False}, name="scrapy-reactor", daemon=True
+        )
+        self._thread.start()
+
+    def crawl(self, spider_name: str, spider_args: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Run one spider to completion and return its stats summary; safe to call from several threads"""
+        done: Future = Future()
+        started = time.time()
+        holder = {}
+
+        def start():
+            try:
+                crawler = holder["crawler"] = self.runner.create_crawler(spider_name)
+                deferred = self.runner.crawl(crawler, **(spider_args or {}))
+            except Exception as e:
+                done.set_exception(e)
+                return
+            deferred.addCallbacks(
+                lambda _: done.set_result(None),
+                lambda failure: done.set_exception(failure.value)
+            )
+
+        self.reactor.callFromThread(start)
+        error = None
+        try:
+            done.result()
+        except Exception as e:
+            error = str(e)
+        crawler = holder.get("crawler")
+        stats = crawler.stats.get_stats() if crawler is not None and crawler.stats else {}
+        summary = crawl_summary(spider_name, stats, time.time() - started, error)
+        print(f"📈 {spider_name}: {summary['items_scraped']} items, {summary['responses']} responses, "
+              f"{summary['errors']} errors in {summary['elapsed_s']}s ({summary['finish_reason']})", flush=True)
+        return summary
+
+
+# Singleton instance
+_runner_instance = None
+_singleton_lock = threading.Lock()
+
+def get_spider_runner() -> SpiderRunner:
+    """Get or create this process's spider runner (and its reactor thread)"""
+    global _runner_instance
+    if _runner_instance is None:
+        with _singleton_lock:
+            if _runner_instance is None:
+                _runner_instance = SpiderRunner()
+    return _runner_instance
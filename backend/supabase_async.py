@@ -0,0 +1,243 @@
+"""
+Async Supabase data access for the FastAPI handlers.
+Mirrors the request-path methods of SupabaseDB on the async PostgREST
+client, so a DB round-trip no longer blocks the worker's event loop.
+Scraper and batch writes stay on the sync SupabaseDB.
+"""
+
+import os
+import asyncio
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+
+from dotenv import load_dotenv
+
+from supabase_utils import get_db, ACTIVITY_TYPES, analytics_since, analytics_summary, get_analytics_cache
+
+load_dotenv()
+
+# Imported when the client is created, like in supabase_utils
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+class AsyncSupabaseDB:
+    """Async counterpart of SupabaseDB for request handlers"""
+
+    def __init__(self, client: Optional["AsyncClient"] = None):
+        self.client = client
+
+    @classmethod
+    async def connect(cls) -> "AsyncSupabaseDB":
+        url = os.environ.get("SUPABASE_URL")
+        key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+        client = None
+        if url and key:
+            try:
+                from supabase import acreate_client
+                client = await acreate_client(url, key)
+            except Exception as e:
+                print(f"Failed to initialize async Supabase: {e}")
+        return cls(client)
+
+    def is_connected(self) -> bool:
+        """Check if Supabase is properly connected"""
+        return self.client is not None
+
+    async def aclose(self):
+        """Release the pooled HTTP connections"""
+        if self.client is not None:
+            try:
+                await self.client.postgrest.aclose()
+            except Exception as e:
+                print(f"⚠️ Async Supabase close failed: {e}")
+
+    async def track_user_activity(self, user_id: str, activity_type: str, product_id: str = None, metadata: Dict = None) -> bool:
+        """Queue an activity event on the shared sink; never waits on the DB"""
+        db = get_db()
+        if not db.is_connected():
+            return False
+        return db.activity.track(user_id, activity_type, product_id, metadata)
+
+    async def get_user_tier(self, user_id: str) -> str:
+        """Fetch the subscription tier for a user"""
+        if not self.is_connected() or not user_id:
+            return "Free"
+        try:
+            response = await self.client.table("profiles").select("subscription_tier").eq("id", user_id).single().execute()
+            if response.data:
+                return response.data.get("subscription_tier", "Free")
+            return "Free"
+        except Exception:
+            return "Free"
+
+    async def set_user_tier(self, user_id: str, tier: str):
+        """Update a user's subscription tier; raises on failure"""
+        await self.client.table("profiles").update({"subscription_tier": tier}).eq("id", user_id).execute()
+
+    async def count_user_activity(self, user_id: str, activity_type: str, since: str) -> int:
+        """Number of activities of one type a user logged since an ISO timestamp"""
+        response = await self.client.table("user_activity").select("id", count="exact", head=True).eq("user_id", user_id).eq("activity_type", activity_type).gte("created_at", since).execute()
+        return response.count or 0
+
+    async def reserve_user_activity(self, user_id: str, activity_type: str, since: str, limit: int,
+                                    metadata: Dict = None) -> Dict[str, Any]:
+        """
+        Log an activity straight away (not through the sink) and rank it among
+        the user's activities of that type since an ISO timestamp.
+        
+        Returns:
+            {"id", "allowed": within the first `limit`, "used": count including this one}
+        """
+        response = await self.client.table("user_activity").insert({
+            "user_id": user_id,
+            "activity_type": activity_type,
+            "metadata": metadata or {}
+        }).execute()
+        activity_id = response.data[0]["id"]
+        ranked = await self.client.table("user_activity").select("id", count="exact").eq("user_id", user_id).eq("activity_type", activity_type).gte("created_at", since).order("created_at").order("id").limit(limit).execute()
+        return {
+            "id": activity_id,
+            "allowed": any(row["id"] == activity_id for row in ranked.data or []),
+            "used": ranked.count or 0
+        }
+
+    async def delete_user_activity(self, activity_id: str):
+        """Remove one logged activity; raises on failure"""
+        await self.client.table("user_activity").delete().eq("id", activity_id).execute()
+
+    async def get_recent_products(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest products first"""
+        response = await self.client.table("products").select("*").order("created_at", desc=True).limit(limit).execute()
+        return response.data or []
+
+    async def save_product(self, user_id: str, product_id: str) -> Dict[str, Any]:
+        """Save a product to user's favorites"""
+        if not self.is_connected():
+            return {"success": False, "error": "Supabase not connected"}
+        try:
+            await self.client.table("saved_products").insert({
+                "user_id": user_id,
+                "product_id": product_id
+            }).execute()
+            await self.track_user_activity(user_id, "save", product_id)
+            return {"success": True, "message": "Product saved"}
+        except Exception as e:
+            error_msg = str(e)
+            if "unique" in error_msg.lower():
+                return {"success": False, "error": "Product already saved"}
+            return {"success": False, "error": error_msg}
+
+    async def remove_saved_product(self, user_id: str, product_id: str) -> bool:
+        """Remove a saved product"""
+        if not self.is_connected():
+            return False
+        try:
+            await self.client.table("saved_products").delete().eq("user_id", user_id).eq("product_id", product_id).execute()
+            return True
+        except Exception as e:
+            print(f"Error removing saved product: {e}")
+            return False
+
+    async def create_comparison(self, user_id: str, product_ids: List[str], notes: str = None) -> Dict[str, Any]:
+        """Create a product comparison"""
+        if not self.is_connected():
+            return {"success": False, "error": "Supabase not connected"}
+        try:
+            response = await self.client.table("comparisons").insert({
+                "user_id": user_id,
+                "product_ids": product_ids,
+                "notes": notes
+            }).execute()
+            await self.track_user_activity(user_id, "compare", metadata={"product_ids": product_ids})
+            comparison_id = response.data[0]["id"] if response.data else None
+            return {
+                "success": True,
+                "message": "Comparison created",
+                "comparison_id": comparison_id
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def get_user_saved_products(self, user_id: str) -> List[str]:
+        """Get list of products saved by user"""
+        if not self.is_connected():
+            return []
+        try:
+            response = await self.client.table("saved_products").select("product_id").eq("user_id", user_id).execute()
+            return [item["product_id"] for item in response.data] if response.data else []
+        except Exception as e:
+            print(f"Error fetching saved products: {e}")
+            return []
+
+    async def get_user_comparisons(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get user's comparisons"""
+        if not self.is_connected():
+            return []
+        try:
+            response = await self.client.table("comparisons").select("*").eq("user_id", user_id).order("created_at", desc=True).execute()
+            return response.data if response.data else []
+        except Exception as e:
+            print(f"Error fetching comparisons: {e}")
+            return []
+
+    async def get_product_analytics(self, days: int = 7) -> Dict[str, Any]:
+        """Activity analytics for the last N days, aggregated in the database and cached briefly"""
+        if not self.is_connected():
+            return {}
+
+        cache = get_analytics_cache()
+        cache_key = f"analytics|{days}"
+        cached = cache.get(cache_key)
+        if cached:
+            return cached
+
+        try:
+            try:
+                response = await self.client.rpc("product_analytics", {"window_days": days}).execute()
+                summary = analytics_summary(response.data or {}, days)
+            except Exception as e:
+                print(f"⚠️ product_analytics RPC unavailable, falling back to counts: {e}")
+                summary = await self._analytics_from_counts(days)
+            cache.set(cache_key, summary)
+            return summary
+        except Exception as e:
+            print(f"Error fetching analytics: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def _analytics_from_counts(self, days: int) -> Dict[str, Any]:
+        """Totals and per-type counts via count-only queries, for databases without the RPC"""
+        since = analytics_since(days)
+        activity = lambda: self.client.table("user_activity").select("id", count="exact", head=True).gte("created_at", since)
+        total_products, total_activities, *by_type = await asyncio.gather(
+            self.client.table("products").select("id", count="exact", head=True).execute(),
+            activity().execute(),
+            *(activity().eq("activity_type", t).execute() for t in ACTIVITY_TYPES)
+        )
+        return analytics_summary({
+            "total_products": total_products.count,
+            "activities": total_activities.count,
+            "by_type": {t: r.count for t, r in zip(ACTIVITY_TYPES, by_type) if r.count},
+        }, days)
+
+
+# Singleton instance
+_async_db_instance = None
+_singleton_lock = asyncio.Lock()
+
+async def get_async_db() -> AsyncSupabaseDB:
+    """Get or create the async Supabase instance for this worker"""
+    global _async_db_instance
+    if _async_db_instance is None:
+        # Concurrent first requests must share one client
+        async with _singleton_lock:
+            if _async_db_instance is None:
+                _async_db_instance = await AsyncSupabaseDB.connect()
+    return _async_db_instance
+
+
+async def close_async_db():
+    """Close the async client on shutdown"""
+    global _async_db_instance
+    if _async_db_instance is not None:
+        await _async_db_instance.aclose()
+        _async_db_instance = None
@@ -4,18 +4,138 @@ Handles all Supabase interactions with proper error handling.
 """
 
 import os
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import json
+import time
+import random
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from ttl_cache import TTLCache
+from activity_sink import ActivitySink
+
 # Load environment variables from .env file
 load_dotenv()
 
-try:
-    from supabase import create_client, Client
-except ImportError:
-    Client = object
-    def create_client(*args): return None
+# supabase (and the HTTP stack under it) is imported when a client is created
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+# products table column -> key in the scraper's product dict
+PRODUCT_COLUMNS = {
+    "id": "id",
+    "name": "name",
+    "category": "category",
+    "price": "price",
+    "image_url": "imageUrl",
+    "velocity_score": "velocityScore",
+    "saturation_score": "saturationScore",
+    "demand_signal": "demandSignal",
+    "weekly_growth": "weeklyGrowth",
+    "reddit_mentions": "redditMentions",
+    "sentiment_score": "sentimentScore",
+    "top_reddit_themes": "topRedditThemes",
+    "last_updated": "lastUpdated",
+    "source": "source",
+    "rating": "rating",
+    "review_count": "reviewCount",
+    "ad_signal": "adSignal",
+    "social_signals": "social_signals",
+    "faqs": "faqs",
+    "competitors": "competitors",
+    "reddit_threads": "redditThreads",
+    "detailed_analysis": "detailed_analysis",
+}
+
+# Columns that don't describe the scraped product: timestamps, and what
+# enrich_new_products writes on top of a scan. detailed_analysis still counts
+# when a caller actually supplies one.
+VOLATILE_COLUMNS = {"created_at", "last_updated", "detailed_analysis", "sentiment_score"}
+HASH_COLUMNS = [column for column in PRODUCT_COLUMNS if column not in VOLATILE_COLUMNS]
+
+# created_at doubles as "last seen" for delete_old_data's 7-day retention, so
+# unchanged rows get it bumped once it is this old instead of on every run
+PRODUCT_TOUCH_AFTER_HOURS = float(os.environ.get("PRODUCT_TOUCH_AFTER_HOURS", "48"))
+ID_BATCH_SIZE = 100
+# Bulk writer: rows per request, concurrent requests, retries per chunk
+SUPABASE_WRITE_CHUNK_SIZE = int(os.environ.get("SUPABASE_WRITE_CHUNK_SIZE", "50"))
+SUPABASE_WRITE_CONCURRENCY = int(os.environ.get("SUPABASE_WRITE_CONCURRENCY", "4"))
+SUPABASE_WRITE_RETRIES = int(os.environ.get("SUPABASE_WRITE_RETRIES", "3"))
+SUPABASE_WRITE_BACKOFF = float(os.environ.get("SUPABASE_WRITE_BACKOFF", "0.5"))
+# Stored hashes remembered in-process so repeat writes skip the lookup
+PRODUCT_HASH_CACHE_TTL = float(os.environ.get("PRODUCT_HASH_CACHE_TTL", "900"))
+PRODUCT_HASH_CACHE_MAX_BYTES = int(os.environ.get("PRODUCT_HASH_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+
+# /analytics/products summaries are served from memory for this long
+ANALYTICS_CACHE_TTL = float(os.environ.get("ANALYTICS_CACHE_TTL", "60"))
+ACTIVITY_TYPES = ("view", "analyze", "compare", "search", "save")
+
+
+def product_row(product: Dict[str, Any], created_at: str) -> Dict[str, Any]:
+    """Map a scraper product dict to a products table row"""
+    row = {column: product.get(key) for column, key in PRODUCT_COLUMNS.items()}
+    row["created_at"] = created_at
+    row["content_hash"] = content_hash(row)
+    return row
+
+
+def _canonical(value):
+    # 30 and 30.0 are the same price whichever scraper produced it
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, list):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+    return value
+
+
+def content_hash(row: Dict[str, Any]) -> str:
+    """Stable hash of a row's content columns, comparable across DB round-trips"""
+    content = {column: _canonical(row.get(column)) for column in HASH_COLUMNS}
+    if row.get("detailed_analysis") is not None:
+        content["detailed_analysis"] = _canonical(row["detailed_analysis"])
+    return hashlib.md5(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _batches(items: List[Any], size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def analytics_since(days: int) -> str:
+    return (datetime.now() - timedelta(days=days)).isoformat()
+
+
+def analytics_summary(data: Dict[str, Any], days: int) -> Dict[str, Any]:
+    """Shape the product_analytics RPC result (or its count-only fallback) for the API"""
+    return {
+        "success": True,
+        "days": days,
+        "total_products": data.get("total_products") or 0,
+        "activities_last_7_days": data.get("activities") or 0,
+        "activities_by_type": data.get("by_type") or {},
+        "activities_by_day": data.get("by_day") or [],
+        "top_products": data.get("top_products") or [],
+    }
+
+
+# Shared by the sync and async clients so either can serve a cached summary
+_analytics_cache = TTLCache(ANALYTICS_CACHE_TTL, 1024 * 1024)
+
+def get_analytics_cache() -> TTLCache:
+    return _analytics_cache
+
+
+def _retryable(error: Exception) -> bool:
+    # Data (22), constraint (23) and schema (42) errors and PostgREST request
+    # errors fail the same way every time; anything else may be transient
+    code = str(getattr(error, "code", "") or "")
+    return not code.startswith(("22", "23", "42", "PGRST"))
 
 
 class SupabaseDB:
@@ -24,84 +144,63 @@ class SupabaseDB:
     def __init__(self):
         self.url = os.environ.get("SUPABASE_URL")
         self.key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-        self.client: Optional[Client] = None
+        self.client: Optional["Client"] = None
         
         if self.url and self.key:
             try:
+                from supabase import create_client
                 self.client = create_client(self.url, self.key)
             except Exception as e:
                 print(f"Failed to initialize Supabase: {e}")
+        
+        # id -> [content_hash, created_at] as last read from or written to the table
+        self._hashes = TTLCache(PRODUCT_HASH_CACHE_TTL, PRODUCT_HASH_CACHE_MAX_BYTES)
+        self._stats_lock = threading.Lock()
+        self.write_stats = {"written": 0, "skipped": 0, "touched": 0, "deleted": 0}
+        # user_activity events are buffered and written in batches
+        self.activity = ActivitySink(lambda rows: self.bulk_insert("user_activity", rows))
     
     def is_connected(self) -> bool:
         """Check if Supabase is properly connected"""
         return self.client is not None
     
-    def upsert_products(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def upsert_products(self, products: List[Dict[str, Any]], skip_unchanged: bool = True) -> Dict[str, Any]:
         """
         Upsert products into Supabase
         
         Args:
             products: List of product dictionaries
+            skip_unchanged: Skip rows whose stored content_hash already matches
             
         Returns:
-            Status dict with success/error info
+            Status dict with success/error info and written/skipped counts
         """
         if not self.is_connected() or not products:
             return {"success": False, "error": "Supabase not connected or no products provided"}
         
         try:
-            # Prepare product data for insertion
-            data = []
-            for p in products:
-                data.append({
-                    "id": p.get("id"),
-                    "name": p.get("name"),
-                    "category": p.get("category"),
-                    "price": p.get("price"),
-                    "image_url": p.get("imageUrl"),
-                    "velocity_score": p.get("velocityScore"),
-                    "saturation_score": p.get("saturationScore"),
-                    "demand_signal": p.get("demandSignal"),
-                    "weekly_growth": p.get("weeklyGrowth"),
-                    "reddit_mentions": p.get("redditMentions"),
-                    "sentiment_score": p.get("sentimentScore"),
-                    "top_reddit_themes": p.get("topRedditThemes"),
-                    "last_updated": p.get("lastUpdated"),
-                    "source": p.get("source"),
-                    "rating": p.get("rating"),
-                    "review_count": p.get("reviewCount"),
-                    "ad_signal": p.get("adSignal"),
-                    "social_signals": p.get("social_signals"),
-                    "faqs": p.get("faqs"),
-                    "competitors": p.get("competitors"),
-                    "reddit_threads": p.get("redditThreads"),
-                    "detailed_analysis": p.get("detailed_analysis"),
-                    "created_at": datetime.now().isoformat()
-                })
+            # Prepare product data for insertion; later duplicates win
+            now = datetime.now()
+            rows = {p["id"]: product_row(p, now.isoformat()) for p in products if p.get("id")}
+            stored = self._stored_hashes(list(rows)) if skip_unchanged else {}
+            changed, touch = self._plan_writes(rows, stored, now)
             
-            # Batch upsert in chunks of 50 to handle already existing products
-            total_saved = 0
-            for i in range(0, len(data), 50):
-                chunk = data[i:i+50]
-                
-                # Ensure all items have an ID
-                clean_chunk = [item for item in chunk if item.get("id")]
-                
-                if not clean_chunk: continue
-
-                print(f"📦 Upserting snapshot chunk of {len(clean_chunk)} items...")
-                try:
-                    # Use upsert to update existing products by ID
-                    response = self.client.table("products").upsert(clean_chunk, on_conflict="id").execute()
-                    total_saved += len(clean_chunk)
-                except Exception as inner_e:
-                    print(f"❌ Chunk Upsert Failed: {inner_e}")
-                    continue
+            write = self._write_rows(changed)
+            total_saved = write["written"]
+            touched = self._touch_rows(touch, now)
+            skipped = len(rows) - len(changed)
+            self._count(written=total_saved, skipped=skipped, touched=touched)
             
             return {
-                "success": total_saved > 0,
-                "message": f"Successfully saved {total_saved} product snapshots",
-                "count": total_saved
+                "success": total_saved > 0 or not changed,
+                "message": f"Saved {total_saved} product snapshots, skipped {skipped} unchanged",
+                "count": total_saved,
+                "written": total_saved,
+                "skipped": skipped,
+                "touched": touched,
+                "failed": write["failed"],
+                "failed_ids": [row["id"] for row in write["failed_rows"]],
+                "chunk_latencies_ms": [chunk["latency_ms"] for chunk in write["chunks"]]
             }
             
         except Exception as e:
@@ -113,6 +212,264 @@ class SupabaseDB:
                 "count": 0
             }
 
+    def _count(self, **counts):
+        with self._stats_lock:
+            for name, value in counts.items():
+                self.write_stats[name] += value
+
+    def _remember_hashes(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            self._hashes.set(row["id"], [row.get("content_hash"), row.get("created_at")])
+
+    def _stored_hashes(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """id -> {content_hash, created_at} for ids already in the table"""
+        stored, missing = {}, []
+        for product_id in ids:
+            cached = self._hashes.get(product_id)
+            if cached:
+                stored[product_id] = {"content_hash": cached[0], "created_at": cached[1]}
+            else:
+                missing.append(product_id)
+        for batch in _batches(missing, ID_BATCH_SIZE):
+            try:
+                response = self.client.table("products").select("id,content_hash,created_at").in_("id", batch).execute()
+            except Exception as e:
+                # Unknown rows are simply written
+                print(f"⚠️ Could not fetch stored hashes: {e}")
+                continue
+            rows = response.data or []
+            self._remember_hashes(rows)
+            for row in rows:
+                stored[row["id"]] = row
+        return stored
+
+    @staticmethod
+    def _plan_writes(rows: Dict[str, Dict[str, Any]], stored: Dict[str, Dict[str, Any]], now: datetime):
+        """Split rows into (changed rows to upsert, unchanged ids whose created_at needs a bump)"""
+        touch_before = (now - timedelta(hours=PRODUCT_TOUCH_AFTER_HOURS)).isoformat()
+        changed, touch = [], []
+        for product_id, row in rows.items():
+            previous = stored.get(product_id)
+            if not previous or previous.get("content_hash") != row["content_hash"]:
+                changed.append(row)
+            elif str(previous.get("created_at") or "") < touch_before:
+                touch.append(product_id)
+        return changed, touch
+
+    def _touch_rows(self, ids: List[str], now: datetime) -> int:
+        """Bump created_at on unchanged rows so retention keeps them"""
+        touched = 0
+        for batch in _batches(ids, ID_BATCH_SIZE):
+            try:
+                self.client.table("products").update({"created_at": now.isoformat()}).in_("id", batch).execute()
+                touched += len(batch)
+                for product_id in batch:
+                    cached = self._hashes.get(product_id)
+                    if cached:
+                        self._hashes.set(product_id, [cached[0], now.isoformat()])
+            except Exception as e:
+                print(f"⚠️ Touch failed for {len(batch)} products: {e}")
+        return touched
+
+    def bulk_upsert(self, table: str, rows: List[Dict[str, Any]], on_conflict: str = "id",
+                    chunk_size: int = None, max_in_flight: int = None) -> Dict[str, Any]:
+        """
+        Upsert rows in chunks with a bounded number of requests in flight
+        (on_conflict=None inserts instead). Transient failures are retried with
+        exponential backoff (upserts only; a retried insert could land twice) and
+        fail the whole chunk once retries run out. A chunk rejected for its data
+        is bisected so a bad row only costs itself.
+        
+        Returns:
+            {"success", "written", "failed", "failed_rows", "chunks", "elapsed_ms"},
+            chunks holding rows/written/attempts/latency_ms per top-level chunk
+        """
+        chunk_size = chunk_size or SUPABASE_WRITE_CHUNK_SIZE
+        max_in_flight = max_in_flight or SUPABASE_WRITE_CONCURRENCY
+        chunks = list(_batches(rows, chunk_size))
+        result = {"success": True, "written": 0, "failed": 0, "failed_rows": [], "chunks": [], "elapsed_ms": 0.0}
+        if not chunks:
+            return result
+        
+        def write_chunk(chunk):
+            start = time.perf_counter()
+            stats = {"rows": len(chunk), "written": 0, "attempts": 0, "failed_rows": [], "error": None}
+            self._write_chunk(table, chunk, on_conflict, stats)
+            stats["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            return stats
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_in_flight, len(chunks)), thread_name_prefix="db-write") as pool:
+            for stats in pool.map(write_chunk, chunks):
+                result["written"] += stats["written"]
+                result["failed_rows"].extend(stats.pop("failed_rows"))
+                result["chunks"].append(stats)
+        result["failed"] = len(result["failed_rows"])
+        result["success"] = result["failed"] == 0
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        
+        failed_note = f", {result['failed']} failed" if result["failed"] else ""
+        print(f"📦 Wrote {result['written']}/{len(rows)} rows to {table} in {len(chunks)} chunks "
+              f"({result['elapsed_ms']:.0f}ms{failed_note})")
+        return result
+
+    def bulk_insert(self, table: str, rows: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        """bulk_upsert for append-only tables"""
+        return self.bulk_upsert(table, rows, on_conflict=None, **kwargs)
+
+    def update_rows(self, table: str, rows: List[Dict[str, Any]], key: str = "id",
+                    max_in_flight: int = None) -> Dict[str, Any]:
+        """
+        Update existing rows matched on key, a bounded number of requests in flight.
+        Unlike an upsert, a row whose key is gone (deleted meanwhile) stays gone.
+        
+        Returns:
+            {"success", "written", "missing", "failed", "failed_rows", "elapsed_ms"}
+        """
+        result = {"success": True, "written": 0, "missing": 0, "failed": 0, "failed_rows": [], "elapsed_ms": 0.0}
+        if not rows:
+            return result
+        
+        def update(row):
+            values = {column: value for column, value in row.items() if column != key}
+            try:
+                response = self.client.table(table).update(values).eq(key, row[key]).execute()
+                return "written" if response.data else "missing"
+            except Exception as e:
+                print(f"❌ Update of {table} {row[key]} failed: {e}")
+                return "failed"
+        
+        start = time.perf_counter()
+        max_in_flight = max_in_flight or SUPABASE_WRITE_CONCURRENCY
+        with ThreadPoolExecutor(max_workers=min(max_in_flight, len(rows)), thread_name_prefix="db-update") as pool:
+            for row, outcome in zip(rows, pool.map(update, rows)):
+                if outcome == "failed":
+                    result["failed_rows"].append(row)
+                else:
+                    result[outcome] += 1
+        result["failed"] = len(result["failed_rows"])
+        result["success"] = result["failed"] == 0
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        print(f"📦 Updated {result['written']}/{len(rows)} rows in {table} "
+              f"({result['missing']} no longer there, {result['failed']} failed, {result['elapsed_ms']:.0f}ms)")
+        return result
+
+    def _write_chunk(self, table: str, chunk: List[Dict[str, Any]], on_conflict: str, stats: Dict[str, Any]):
+        """Write one chunk with retries, bisecting it if the data is rejected"""
+        # Only upserts are idempotent; an insert that timed out may still have landed
+        retries = SUPABASE_WRITE_RETRIES if on_conflict is not None else 0
+        error = None
+        for attempt in range(retries + 1):
+            stats["attempts"] += 1
+            try:
+                query = self.client.table(table)
+                query = query.insert(chunk) if on_conflict is None else query.upsert(chunk, on_conflict=on_conflict)
+                query.execute()
+                stats["written"] += len(chunk)
+                return
+            except Exception as e:
+                error = e
+                if not _retryable(e) or attempt == retries:
+                    break
+                time.sleep(SUPABASE_WRITE_BACKOFF * (2 ** attempt) + random.uniform(0, SUPABASE_WRITE_BACKOFF))
+        
+        if _retryable(error):
+            # Outage or timeout, not bad data: splitting would only multiply requests
+            print(f"❌ {len(chunk)} rows not written to {table}: {error}")
+            stats["failed_rows"].extend(chunk)
+            stats["error"] = str(error)
+            return
+        if len(chunk) > 1:
+            middle = len(chunk) // 2
+            self._write_chunk(table, chunk[:middle], on_conflict, stats)
+            self._write_chunk(table, chunk[middle:], on_conflict, stats)
+            return
+        print(f"❌ Row rejected by {table}: {error}")
+        stats["failed_rows"].extend(chunk)
+        stats["error"] = str(error)
+
+    def _write_rows(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Bulk-upsert prepared product rows and remember the hashes that landed"""
+        result = self.bulk_upsert("products", data)
+        failed = {id(row) for row in result["failed_rows"]}
+        self._remember_hashes([row for row in data if id(row) not in failed])
+        return result
+
+    def _existing_category_rows(self, category: str, page_size: int = 1000) -> Dict[str, Dict[str, Any]]:
+        """id -> {content_hash, created_at} for every stored product in a category"""
+        existing = {}
+        start = 0
+        while True:
+            response = self.client.table("products").select("id,content_hash,created_at").eq("category", category).range(start, start + page_size - 1).execute()
+            rows = response.data or []
+            self._remember_hashes(rows)
+            for row in rows:
+                existing[row["id"]] = row
+            if len(rows) < page_size:
+                return existing
+            start += page_size
+
+    def sync_category_products(self, category: str, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Diff-based replacement for clear_category_products + upsert_products.
+        Upserts only products whose content_hash changed, bumps created_at on unchanged rows
+        nearing retention, then deletes rows the scan no longer returned.
+        """
+        if not self.is_connected():
+            return {"success": False, "error": "Supabase not connected"}
+        
+        now = datetime.now()
+        # Later duplicates win, as they would within a single upsert
+        rows = {p["id"]: product_row(p, now.isoformat()) for p in products if p.get("id")}
+        if not rows:
+            # An empty scan must never wipe a category
+            return {"success": False, "error": "No products to sync", "count": 0}
+        
+        try:
+            existing = self._existing_category_rows(category)
+        except Exception as e:
+            print(f"❌ Could not load existing {category} products: {e}")
+            return {"success": False, "error": str(e), "count": 0}
+        
+        changed, touch = self._plan_writes(rows, existing, now)
+        gone = [product_id for product_id in existing if product_id not in rows]
+        
+        write = self._write_rows(changed)
+        saved = write["written"]
+        if changed and not saved:
+            # Keep the old rows rather than leave the category half-replaced
+            return {"success": False, "error": "Upsert failed, category left unchanged", "count": 0}
+        
+        touched = self._touch_rows(touch, now)
+        deleted = 0
+        for ids in _batches(gone, ID_BATCH_SIZE):
+            try:
+                self.client.table("products").delete().in_("id", ids).execute()
+                deleted += len(ids)
+            except Exception as e:
+                print(f"⚠️ Delete failed for {len(ids)} {category} products: {e}")
+        if deleted:
+            self._hashes.clear()
+        self._count(written=saved, skipped=len(rows) - len(changed), touched=touched, deleted=deleted)
+        
+        inserted = sum(1 for row in changed if row["id"] not in existing)
+        summary = {
+            "success": True,
+            "count": saved,
+            "inserted": inserted,
+            "updated": len(changed) - inserted,
+            "unchanged": len(rows) - len(changed),
+            "written": saved,
+            "skipped": len(rows) - len(changed),
+            "touched": touched,
+            "deleted": deleted,
+            "failed": write["failed"],
+            "chunk_latencies_ms": [chunk["latency_ms"] for chunk in write["chunks"]],
+        }
+        print(f"🔄 Synced {category}: {summary['inserted']} new, {summary['updated']} changed, "
+              f"{summary['unchanged']} unchanged ({touched} touched), {deleted} removed")
+        return summary
+
     def delete_old_data(self, days: int = 7) -> Dict[str, Any]:
         """Delete product data older than N days"""
         if not self.is_connected():
@@ -125,6 +482,7 @@ class SupabaseDB:
             
             print(f"🗑️ Cleaning up products older than {threshold}...")
             response = self.client.table("products").delete().lt("created_at", threshold).execute()
+            self._hashes.clear()
             return {"success": True, "count": len(response.data) if response.data else 0}
         except Exception as e:
             print(f"❌ Cleanup failed: {e}")
@@ -136,6 +494,7 @@ class SupabaseDB:
             return False
         try:
             self.client.table("products").delete().eq("category", category).execute()
+            self._hashes.clear()
             print(f"🗑️ Cleared products for category: {category}")
             return True
         except Exception as e:
@@ -144,7 +503,8 @@ class SupabaseDB:
     
     def track_user_activity(self, user_id: str, activity_type: str, product_id: str = None, metadata: Dict = None) -> bool:
         """
-        Track user activity for analytics
+        Track user activity for analytics. The event is queued and written
+        by the activity sink in the background.
         
         Args:
             user_id: UUID of the user
@@ -153,25 +513,11 @@ class SupabaseDB:
             metadata: Optional metadata dict
             
         Returns:
-            True if successful, False otherwise
+            True if queued, False if disconnected or the queue is full
         """
         if not self.is_connected():
             return False
-        
-        try:
-            activity_data = {
-                "user_id": user_id,
-                "activity_type": activity_type,
-                "product_id": product_id,
-                "metadata": metadata or {}
-            }
-            
-            self.client.table("user_activity").insert(activity_data).execute()
-            return True
-            
-        except Exception as e:
-            print(f"Error tracking activity: {e}")
-            return False
+        return self.activity.track(user_id, activity_type, product_id, metadata)
     
     def get_user_tier(self, user_id: str) -> str:
         """Fetch the subscription tier for a user"""
@@ -288,27 +634,44 @@ class SupabaseDB:
             return []
     
     def get_product_analytics(self, days: int = 7) -> Dict[str, Any]:
-        """Get product analytics for last N days"""
+        """
+        Activity analytics for the last N days, aggregated in the database by
+        the product_analytics RPC and cached for ANALYTICS_CACHE_TTL seconds
+        """
         if not self.is_connected():
             return {}
         
+        cache_key = f"analytics|{days}"
+        cached = _analytics_cache.get(cache_key)
+        if cached:
+            return cached
+        
         try:
-            # Get total products
-            total_products = self.client.table("products").select("id", count="exact").execute()
-            
-            # Get recent activity
-            response = self.client.table("user_activity").select("*").gte("created_at", f"now() - interval '{days} days'").execute()
-            
-            return {
-                "total_products": total_products.count if hasattr(total_products, 'count') else 0,
-                "activities_last_7_days": len(response.data) if response.data else 0,
-                "success": True
-            }
+            try:
+                response = self.client.rpc("product_analytics", {"window_days": days}).execute()
+                summary = analytics_summary(response.data or {}, days)
+            except Exception as e:
+                print(f"⚠️ product_analytics RPC unavailable, falling back to counts: {e}")
+                summary = self._analytics_from_counts(days)
+            _analytics_cache.set(cache_key, summary)
+            return summary
             
         except Exception as e:
             print(f"Error fetching analytics: {e}")
             return {"success": False, "error": str(e)}
 
+    def _analytics_from_counts(self, days: int) -> Dict[str, Any]:
+        """Totals and per-type counts via count-only queries, for databases without the RPC"""
+        since = analytics_since(days)
+        activity = lambda: self.client.table("user_activity").select("id", count="exact", head=True).gte("created_at", since)
+        total_products = self.client.table("products").select("id", count="exact", head=True).execute()
+        by_type = {t: activity().eq("activity_type", t).execute().count or 0 for t in ACTIVITY_TYPES}
+        return analytics_summary({
+            "total_products": total_products.count,
+            "activities": activity().execute().count,
+            "by_type": {t: n for t, n in by_type.items() if n},
+        }, days)
+
 
 # Singleton instance
 _db_instance = None
@@ -0,0 +1,130 @@
+"""
+/api/ai/analyze on the Modal web app: quota reservations are logged in
+user_activity for signed-in users and removed when the analysis doesn't
+go through.
+"""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("modal")
+from fastapi.testclient import TestClient
+
+import modal_scraper
+import quota
+import supabase_async
+
+
+class FakeDB:
+    """user_activity as a list shared by every "container" using it"""
+
+    def __init__(self, tier="Free"):
+        self.tier = tier
+        self.activity = []  # (id, user_id, activity_type), oldest first
+        self.tracked = []
+
+    async def get_user_tier(self, user_id):
+        return self.tier
+
+    async def reserve_user_activity(self, user_id, activity_type, since, limit, metadata=None):
+        activity_id = f"a{len(self.activity) + len(self.tracked)}"
+        self.activity.append((activity_id, user_id, activity_type))
+        ranked = [row[0] for row in self.activity if row[1:] == (user_id, activity_type)]
+        return {"id": activity_id, "allowed": activity_id in ranked[:limit], "used": len(ranked)}
+
+    async def delete_user_activity(self, activity_id):
+        self.activity = [row for row in self.activity if row[0] != activity_id]
+
+    async def track_user_activity(self, user_id, activity_type, product_id=None, metadata=None):
+        self.tracked.append((user_id, activity_type))
+        return True
+
+    def used(self, user_id, activity_type):
+        return sum(row[1:] == (user_id, activity_type) for row in self.activity)
+
+
+@pytest.fixture
+def setup():
+    db = FakeDB()
+    service = quota.QuotaService()
+    analyze = mock.Mock(return_value={"success": True, "data": {}})
+    analyzer = mock.Mock()
+    analyzer.return_value.analyze.remote = analyze
+
+    async def get_async_db():
+        return db
+
+    with mock.patch.object(modal_scraper, "ProductAnalyzer", analyzer), \
+         mock.patch.object(supabase_async, "get_async_db", get_async_db), \
+         mock.patch.object(quota, "get_quota_service", return_value=service), \
+         mock.patch.object(service, "acquire", wraps=service.acquire) as acquire, \
+         mock.patch.object(service, "release", wraps=service.release) as release:
+        client = TestClient(modal_scraper.web_app, raise_server_exceptions=False)
+        yield client, db, service, analyze, acquire, release
+
+
+def post(client, **body):
+    return client.post("/api/ai/analyze", json={"productName": "earbuds", **body})
+
+
+def test_anonymous_request_skips_quota(setup):
+    client, db, service, analyze, acquire, release = setup
+    assert post(client).json()["success"] is True
+    analyze.assert_called_once_with("earbuds")
+    acquire.assert_not_called()
+    assert db.activity == [] and db.tracked == []
+
+
+def test_user_request_reserves_activity(setup):
+    client, db, service, analyze, acquire, release = setup
+    assert post(client, userId="u1").status_code == 200
+    acquire.assert_called_once_with(db, "u1", "analyze", metadata={"product": "earbuds"})
+    release.assert_not_called()
+    assert db.used("u1", "analyze") == 1
+    assert db.tracked == []
+
+
+def test_unmetered_tier_tracks_activity(setup):
+    client, db, service, analyze, acquire, release = setup
+    db.tier = "Pro"
+    assert post(client, userId="u1").status_code == 200
+    assert db.activity == []
+    assert db.tracked == [("u1", "analyze")]
+
+
+def test_free_limit_rejects_without_running(setup):
+    client, db, service, analyze, acquire, release = setup
+    for _ in range(quota.DAILY_LIMITS["Free"]["analyze"]):
+        assert post(client, userId="u1").status_code == 200
+    analyze.reset_mock()
+    response = post(client, userId="u1")
+    assert response.status_code == 403
+    analyze.assert_not_called()
+    assert db.used("u1", "analyze") == quota.DAILY_LIMITS["Free"]["analyze"]
+
+
+def test_limit_is_shared_across_containers(setup):
+    client, db, service, analyze, acquire, release = setup
+    # Uses reserved through other containers' quota services count too
+    for _ in range(quota.DAILY_LIMITS["Free"]["analyze"]):
+        assert asyncio.run(quota.QuotaService().acquire(db, "u1", "analyze"))["allowed"]
+    assert post(client, userId="u1").status_code == 403
+
+
+def test_unsuccessful_analysis_releases(setup):
+    client, db, service, analyze, acquire, release = setup
+    analyze.return_value = {"success": False, "error": "no results"}
+    assert post(client, userId="u1").status_code == 200
+    release.assert_called_once()
+    assert db.used("u1", "analyze") == 0
+    assert db.tracked == []
+
+
+def test_failed_analysis_releases(setup):
+    client, db, service, analyze, acquire, release = setup
+    analyze.side_effect = RuntimeError("modal down")
+    assert post(client, userId="u1").status_code == 500
+    release.assert_called_once()
+    assert db.used("u1", "analyze") == 0
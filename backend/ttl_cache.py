@@ -0,0 +1,115 @@
+"""
+Generic JSON-value TTL cache: a size-capped in-memory LRU with an optional
+SQLite file as a durable tier. Used by the search, image and AI caches.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+
+class TTLCache:
+    """Memory LRU capped by payload bytes, backed by an optional SQLite table"""
+
+    def __init__(self, ttl: float, max_bytes: int, path: Optional[str] = None, table: str = "cache"):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.table = table
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, payload)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self.counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0, "writes": 0}
+
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, expires_at REAL, payload TEXT)")
+                self._db.execute(f"DELETE FROM {table} WHERE expires_at < ?", (time.time(),))
+                self._db.commit()
+            except Exception as e:
+                print(f"⚠️ Cache disk tier unavailable ({path}): {e}")
+                self._db = None
+
+    def _remember(self, key: str, expires_at: float, payload: str):
+        old = self._entries.pop(key, None)
+        if old:
+            self._bytes -= len(old[1])
+        self._entries[key] = (expires_at, payload)
+        self._bytes += len(payload)
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.counters["evictions"] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                self.counters["memory_hits"] += 1
+                return json.loads(entry[1])
+            if entry:
+                self._entries.pop(key)
+                self._bytes -= len(entry[1])
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        f"SELECT expires_at, payload FROM {self.table} WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row and row[0] > now:
+                        self._remember(key, row[0], row[1])
+                        self.counters["hits"] += 1
+                        self.counters["disk_hits"] += 1
+                        return json.loads(row[1])
+                except Exception as e:
+                    print(f"⚠️ Cache read failed: {e}")
+
+            self.counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError):
+            return
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, expires_at, payload)
+            self.counters["writes"] += 1
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        f"INSERT OR REPLACE INTO {self.table} (key, expires_at, payload) VALUES (?, ?, ?)",
+                        (key, expires_at, payload)
+                    )
+                    self._db.commit()
+                except Exception as e:
+                    print(f"⚠️ Cache write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self.table}")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "disk_tier": self._db is not None
+            }
@@ -49,6 +49,9 @@ export interface ActivityTrackingResponse {
 export interface AnalyticsResponse {
   total_products: number;
   activities_last_7_days: number;
+  activities_by_type?: Record<string, number>;
+  activities_by_day?: { day: string; count: number }[];
+  top_products?: { product_id: string; count: number }[];
   success: boolean;
   error?: string;
 }
@@ -21,6 +21,7 @@ create table if not exists public.products (
     faqs jsonb,
     competitors jsonb,
     reddit_threads jsonb,
+    content_hash text,
     created_at timestamp with time zone default now(),
     updated_at timestamp with time zone default now()
 );
@@ -149,4 +150,44 @@ drop trigger if exists on_auth_user_created on auth.users;
 create trigger on_auth_user_created after
 insert
     on auth.users for each row
-execute procedure public.handle_new_user ();
\ No newline at end of file
+execute procedure public.handle_new_user ();
+
+-- Activity analytics aggregated in the database (called via rpc from the API)
+create or replace function public.product_analytics(window_days integer default 7, top_n integer default 10)
+returns json as
+$$
+	with recent as (
+	    select activity_type, product_id, created_at
+	    from public.user_activity
+	    where created_at >= now() - make_interval(days => window_days)
+	)
+	select json_build_object(
+	    'total_products', (select count(*) from public.products),
+	    'activities', (select count(*) from recent),
+	    'by_type', coalesce((
+	        select json_object_agg(activity_type, n)
+	        from (select activity_type, count(*) as n from recent group by activity_type) t
+	    ), '{}'::json),
+	    'by_day', coalesce((
+	        select json_agg(json_build_object('day', day, 'count', n) order by day)
+	        from (select created_at::date as day, count(*) as n from recent group by 1) d
+	    ), '[]'::json),
+	    'top_products', coalesce((
+	        select json_agg(json_build_object('product_id', product_id, 'count', n) order by n desc)
+	        from (
+	            select product_id, count(*) as n from recent
+	            where product_id is not null
+	            group by product_id order by n desc limit top_n
+	        ) p
+	    ), '[]'::json)
+	);
+$$
+language
+sql stable
+
+security definer
+set search_path = public, pg_temp;
+
+-- Aggregates span every user's activity: only the API's service role may call it
+revoke execute on function public.product_analytics(integer, integer) from public, anon, authenticated;
+grant execute on function public.product_analytics(integer, integer) to service_role;